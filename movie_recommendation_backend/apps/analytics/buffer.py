@@ -0,0 +1,121 @@
+"""
+Batched writer for the request activity rows.
+
+UserActivityLoggingMiddleware used to INSERT one UserActivityLog row per request inside
+the response path. It now appends the unsaved row to an ActivityLogBuffer, and a background
+thread writes the buffered rows with one bulk_create every few seconds, or sooner once a
+full batch is waiting.
+
+Trade-off: rows show up in the admin/analytics a few seconds late. Their timestamp is
+still the time of the request, it is set when the row is built, not when it is inserted.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.db import close_old_connections, transaction
+
+from .models import UserActivityLog
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT, and a flush is started early once this many are waiting
+ACTIVITY_LOG_BATCH_SIZE = 500
+# Seconds between flushes when traffic is low
+ACTIVITY_LOG_FLUSH_INTERVAL = 2.0
+# Rows kept in memory at most. When the database falls this far behind new rows are
+# dropped, activity logging must never block or grow memory on the request threads
+ACTIVITY_LOG_BUFFER_SIZE = 10_000
+
+
+class ActivityLogBuffer:
+    """Per-process buffer of unsaved UserActivityLog rows, flushed by a background thread."""
+
+    def __init__(self, batch_size=ACTIVITY_LOG_BATCH_SIZE, flush_interval=ACTIVITY_LOG_FLUSH_INTERVAL,
+                 max_size=ACTIVITY_LOG_BUFFER_SIZE):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.dropped = 0
+        self._rows = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def append(self, activity):
+        """Queue an unsaved UserActivityLog for the next flush."""
+        self._ensure_started()
+        with self._lock:
+            if len(self._rows) >= self.max_size:
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning("Activity log buffer is full, %s rows dropped so far", self.dropped)
+                return
+            self._rows.append(activity)
+            pending = len(self._rows)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write every buffered row, batch_size rows per INSERT."""
+        with self._lock:
+            rows = list(self._rows)
+            self._rows.clear()
+
+        for start in range(0, len(rows), self.batch_size):
+            self._write(rows[start:start + self.batch_size])
+
+    def _write(self, batch):
+        # Each batch is its own transaction, a failure only costs that batch, and then only
+        # its bad rows: the batch is retried row by row
+        try:
+            with transaction.atomic():
+                UserActivityLog.objects.bulk_create(batch)
+            return
+        except Exception as e:
+            logger.warning("Failed to write %s buffered activity logs, retrying one by one: %s", len(batch), e)
+
+        failed = 0
+        for activity in batch:
+            try:
+                with transaction.atomic():
+                    activity.save(force_insert=True)
+            except Exception as e:
+                failed += 1
+                error = e
+        if failed:
+            with self._lock:
+                self.dropped += failed
+            logger.error("Dropped %s activity logs that could not be written: %s", failed, error)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='activity-log-buffer', daemon=True)
+                self._thread.start()
+
+    def _reset_after_fork(self):
+        # Threads don't survive fork (gunicorn --preload), each worker starts its own on first
+        # append. Rows copied over from the parent are the parent's to write, not ours
+        self._rows = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            # Long-lived thread, honour CONN_MAX_AGE and drop broken connections between flushes
+            close_old_connections()
+            self.flush()
+
+
+activity_log_buffer = ActivityLogBuffer()
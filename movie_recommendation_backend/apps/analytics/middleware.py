@@ -3,9 +3,9 @@ import time
 import uuid
 import logging
 from django.utils.deprecation import MiddlewareMixin
-from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from .models import UserActivityLog
+from .buffer import activity_log_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -162,7 +162,7 @@ class UserActivityLoggingMiddleware(MiddlewareMixin):
             return "movie_view"
     
     def _log_activity_async(self, **kwargs):
-        """Log activity to database with error handling"""
+        """Buffer the activity, it is written to the database in batches by activity_log_buffer"""
         try:
             # Handle anonymous users - only log if user is authenticated
             # since your model's user field appears to be required
@@ -171,9 +171,8 @@ class UserActivityLoggingMiddleware(MiddlewareMixin):
                 # Skip logging for anonymous users since your model requires a user
                 return
             
-            # Use atomic transaction for data integrity
-            with transaction.atomic():
-                UserActivityLog.log_activity(**kwargs)
+            # One bulk INSERT per batch instead of an INSERT on every response
+            activity_log_buffer.append(UserActivityLog.build_activity(**kwargs))
                 
         except Exception as e:
             logger.error(f"Failed to log user activity: {e}")
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:23
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction, it keeps the activity log writable
+    atomic = False
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('movies', '0004_alter_movie_omdb_rating_alter_movie_our_rating_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='useractivitylog',
+            index=models.Index(fields=['user', '-timestamp'], include=('action_type', 'source'), name='idx_activity_logs_user_ts'),
+        ),
+    ]
@@ -37,7 +37,8 @@ class UserActivityLog(models.Model):
     source = models.CharField(max_length=50, null=True, blank=True)  # Source of the action (e.g., web, mobile app)
     metadata = models.JSONField(null=True, blank=True)  # Additional metadata about the action
     # Timestamps
-    timestamp = models.DateTimeField(auto_now_add=True)  # When the action was performed
+    # Set when the row is built, not when it is inserted, buffered rows are written seconds later
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)  # When the action was performed
 
     class Meta:
         db_table = 'user_activity_logs'
@@ -47,6 +48,8 @@ class UserActivityLog(models.Model):
 
         indexes = [
             models.Index(fields=['user', 'action_type'], name = 'idx_activity_logs_user_action'),
+            # A user's latest activities, the included columns let Postgres answer them from the index alone
+            models.Index(fields=['user', '-timestamp'], include=['action_type', 'source'], name='idx_activity_logs_user_ts'),
             models.Index(fields=['movie_id', 'action_type'], name='idx_activity_logs_movie_action'),
             models.Index(fields=['timestamp'], name='idx_activity_logs_timestamp'),
             models.Index(fields=['session_id'], name='idx_activity_logs_session'),
@@ -85,7 +88,17 @@ class UserActivityLog(models.Model):
         """
         This one logs user activity to the database.
         """
-        return cls.objects.create(
+        activity = cls.build_activity(action_type, session_id, ip_address, user_agent, source,
+                                      user=user, movie=movie, referer=referer, metadata=metadata)
+        activity.save(force_insert=True)
+        return activity
+
+    @classmethod
+    def build_activity(cls, action_type, session_id, ip_address, user_agent, source, user=None, movie=None, referer=None, metadata=None):
+        """
+        Build an unsaved activity log, for callers that write logs in batches.
+        """
+        return cls(
             user=user,
             session_id=session_id,
             action_type=action_type,
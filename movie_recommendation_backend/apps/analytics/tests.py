@@ -1,3 +1,62 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-# Create your tests here.
+from apps.authentication.models import User
+
+from .buffer import ActivityLogBuffer
+from .models import UserActivityLog
+
+
+class ActivityLogBufferTests(TestCase):
+    """Buffered UserActivityLog rows written by ActivityLogBuffer.flush()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='buffered', email='buffered@example.com', password='x')
+
+    def setUp(self):
+        # Long interval and a batch size above the row count, the background thread never
+        # flushes during the test and the rows are written by the explicit flush() below
+        self.buffer = ActivityLogBuffer(batch_size=100, flush_interval=3600)
+
+    def _build(self, action_type='movie_view'):
+        return UserActivityLog.build_activity(
+            action_type=action_type, session_id='session', ip_address='127.0.0.1',
+            user_agent='tests', source='web', user=self.user,
+        )
+
+    def test_flush_writes_every_buffered_row_with_its_request_time(self):
+        built_from = timezone.now()
+        for _ in range(3):
+            self.buffer.append(self._build())
+        built_until = timezone.now()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.buffer.flush()
+
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        timestamps = list(UserActivityLog.objects.filter(user=self.user).values_list('timestamp', flat=True))
+        self.assertEqual(len(timestamps), 3)
+        for timestamp in timestamps:
+            self.assertGreaterEqual(timestamp, built_from)
+            self.assertLessEqual(timestamp, built_until)
+
+    def test_flush_with_nothing_buffered_runs_no_query(self):
+        with self.assertNumQueries(0):
+            self.buffer.flush()
+
+    def test_invalid_row_only_drops_itself(self):
+        buffer = ActivityLogBuffer(batch_size=2, flush_interval=3600)
+        buffer.append(self._build())
+        buffer.append(self._build(action_type='x' * 51))  # Longer than the column allows
+        buffer.append(self._build())
+        buffer.append(self._build())
+
+        buffer.flush()
+
+        self.assertEqual(UserActivityLog.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(buffer.dropped, 1)
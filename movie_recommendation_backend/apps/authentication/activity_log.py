@@ -0,0 +1,88 @@
+"""
+Background writer for the user activity log.
+
+The views only hand a record to the 'user_activity' logger. Its configured handlers
+(see LOGGING in settings) are moved behind a QueueHandler, and a QueueListener thread
+formats and writes the records, so the file I/O never runs on the request thread.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+ACTIVITY_LOGGER_NAME = 'user_activity'
+
+# Records waiting for the listener. When it falls this far behind new records are
+# dropped, a slow disk must never block or grow memory on the request threads
+ACTIVITY_LOG_QUEUE_SIZE = 10_000
+
+logger = logging.getLogger(__name__)
+
+_queue_handler = None
+_listener = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of raising."""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning("User activity log queue is full, %s records dropped so far", self.dropped)
+
+
+def _new_queue():
+    return queue.Queue(maxsize=ACTIVITY_LOG_QUEUE_SIZE)
+
+
+def _start_listener(handlers):
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # Threads don't survive fork (gunicorn --preload), so each worker gets its own listener
+    if _listener is None:
+        return
+    handlers = _listener.handlers
+    _queue_handler.queue = _new_queue()
+    _start_listener(handlers)
+
+
+def stop_activity_log_listener():
+    """Flush the queued records and stop the listener thread."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def start_activity_log_listener():
+    """
+    Move the handlers of the user_activity logger behind a queue and start the listener.
+    Called once from AuthenticationConfig.ready(), after LOGGING has been applied.
+    """
+    global _queue_handler
+    if _listener is not None:
+        return
+
+    activity_logger = logging.getLogger(ACTIVITY_LOGGER_NAME)
+    handlers = activity_logger.handlers[:]
+    if not handlers:
+        # Nothing configured to write to, leave the logger alone
+        return
+
+    for handler in handlers:
+        activity_logger.removeHandler(handler)
+    _queue_handler = DroppingQueueHandler(_new_queue())
+    activity_logger.addHandler(_queue_handler)
+
+    _start_listener(handlers)
+    atexit.register(stop_activity_log_listener)
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -5,3 +5,6 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
 
+    def ready(self):
+        from .activity_log import start_activity_log_listener
+        start_activity_log_listener()  # Write user activity records off the request thread
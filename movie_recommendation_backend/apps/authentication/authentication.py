@@ -0,0 +1,79 @@
+"""
+Authentication backends for the movie recommendation backend.
+
+This file contains the JWT authentication class used by DRF. It caches the user
+that a token resolves to, so authenticated requests do not have to hit the users
+table on every call.
+"""
+
+import copy
+import threading
+
+from cachetools import TTLCache
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+# How long (in seconds) a resolved user stays in the cache
+USER_CACHE_TIMEOUT = 60 * 5
+
+# Process-local copy in front of Redis. It can't be invalidated from other processes,
+# so it is kept short, a change to a user reaches every worker within this many seconds
+LOCAL_USER_CACHE_TIMEOUT = 30
+_local_users = TTLCache(maxsize=10_000, ttl=LOCAL_USER_CACHE_TIMEOUT)
+_local_users_lock = threading.Lock()
+
+
+def user_cache_key(user_id):
+    """Cache key for the user that a token with this user_id resolves to."""
+    return f"jwt:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached user so the next authenticated request reloads it."""
+    with _local_users_lock:
+        _local_users.pop(str(user_id), None)
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that keeps the resolved user in the cache.
+
+    The token already carries the user_id, so on a cache hit we skip the
+    SELECT on the users table. Lookups go to a short-lived in-process cache
+    first, then Redis, and every request gets its own copy of the user. Cached
+    users are invalidated whenever the user is saved (see the post_save handler
+    in models.py).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            # Let simplejwt raise its usual InvalidToken error
+            return super().get_user(validated_token)
+
+        # Token claims may come back as int or str, key the local cache on one form
+        local_key = str(user_id)
+        with _local_users_lock:
+            shared_user = _local_users.get(local_key)
+
+        if shared_user is None:
+            cache_key = user_cache_key(user_id)
+            shared_user = cache.get(cache_key)
+            if shared_user is None:
+                shared_user = super().get_user(validated_token)
+                cache.set(cache_key, shared_user, USER_CACHE_TIMEOUT)
+            with _local_users_lock:
+                _local_users[local_key] = shared_user
+
+        # The local instance is shared by every request in the process and views change
+        # request.user in place (set_password, last_login, ...), so each request gets a copy
+        user = copy.copy(shared_user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
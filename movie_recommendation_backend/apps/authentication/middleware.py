@@ -0,0 +1,20 @@
+"""
+Middleware for the authentication app.
+"""
+
+from ipware import get_client_ip
+
+
+class ClientIPMiddleware:
+    """
+    Resolve the client IP once per request and store it as request.client_ip.
+    ipware takes care of X-Forwarded-For and the other proxy headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        ip, _ = get_client_ip(request)
+        request.client_ip = ip or 'unknown'
+        return self.get_response(request)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:08
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction, it keeps the users table writable
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0003_alter_user_algorithm_preference'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), condition=models.Q(('is_active', True)), name='idx_users_username_trgm_act'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), condition=models.Q(('is_active', True)), name='idx_users_first_name_trgm_act'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), condition=models.Q(('is_active', True)), name='idx_users_last_name_trgm_act'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 import re #Regular expressions for validation
 import json
+import orjson
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -16,8 +19,8 @@ def safe_json_loads(value, default=None):
         return value  # Already parsed
     if isinstance(value, str) and value.strip():
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, ValueError):
+            return orjson.loads(value)
+        except (orjson.JSONDecodeError, ValueError):
             return default or []
     return default or []
 
@@ -138,6 +141,15 @@ class User(AbstractUser):
             models.Index(fields=['device_token'], name='idx_users_device_token'),
             models.Index(fields=['country'], name='idx_users_country'),
             models.Index(fields=['created_at'], name='idx_users_created_at'),
+            # Trigram indexes for the user search. icontains compiles to
+            # UPPER(column) LIKE UPPER('%q%'), so the indexes are on UPPER(column).
+            # The search only returns active users, so inactive rows are left out.
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='idx_users_username_trgm_act',
+                     condition=models.Q(is_active=True)),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='idx_users_first_name_trgm_act',
+                     condition=models.Q(is_active=True)),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='idx_users_last_name_trgm_act',
+                     condition=models.Q(is_active=True)),
         ]
 
 # Custom properties and methods
@@ -318,6 +330,10 @@ def user_post_save(sender, instance, created, **kwargs):
         # Example: Create notification preferences automatically
         # (We'll implement this when we create the notifications app)
         pass
+    else:
+        # Drop the cached JWT user so authenticated requests see the change
+        from .authentication import invalidate_cached_user
+        invalidate_cached_user(instance.pk)
 
 
 @receiver(pre_delete, sender=User)
@@ -327,6 +343,9 @@ def user_pre_delete(sender, instance, **kwargs):
     Can be used for cleanup or logging.
     """
     print(f"User being deleted: {instance.username}")
+
+    from .authentication import invalidate_cached_user
+    invalidate_cached_user(instance.pk)
     
     # Example: Clean up user's uploaded files
     if instance.avatar:
@@ -178,23 +178,22 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         # Remove password_confirm from validated_data
         validated_data.pop('password_confirm', None)
         
-        # Handle favorite genres with JSON conversion
-        favorite_genres = validated_data.pop('favorite_genres', [])
+        # favorite_genres is a JSONField, so the list is stored as is
+        validated_data['favorite_genres'] = validated_data.get('favorite_genres') or []
+
+        # Registration logs the user in, set it here so the INSERT carries it
+        validated_data['last_login'] = timezone.now()
         
         # Extract password to handle separately
         password = validated_data.pop('password')
         
         # Create user with create_user method (properly hashes password)
+        # This is the only write, no follow-up save() is needed
         user = User.objects.create_user(
             password=password,
             **validated_data
         )
         
-        # Set the favorite genres as a JSON string
-        if favorite_genres:
-            user.favorite_genres = json.dumps(favorite_genres)
-            user.save()
-        
         return user
     
     def get_age(self, obj):
@@ -370,7 +369,8 @@ class PasswordChangeSerializer(serializers.Serializer):
         new_password = self.validated_data['new_password']
         user.set_password(new_password)
         user.last_password_change = timezone.now()
-        user.save()
+        # Only write the columns that changed, updated_at has to be listed for auto_now to apply
+        user.save(update_fields=['password', 'updated_at'])
         return user
     
 class LoginSerializer(serializers.Serializer):
@@ -447,6 +447,15 @@ class UserDeviceSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"device_token": "Device token is required if device type is provided."})
 
         return value
+
+    def update(self, instance, validated_data):
+        """
+        Update the device fields with a single UPDATE on just those columns.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
     
 
 # UTILITY SERIALIZERS
@@ -0,0 +1,10 @@
+from celery import shared_task
+import logging
+
+# Same logger log_user_action writes to when it runs in the web process
+activity_logger = logging.getLogger('user_activity')
+
+@shared_task(ignore_result=True, acks_late=False)
+def record_user_action_task(log_data):
+    """Write a user action prepared by log_user_action to the activity log"""
+    activity_logger.info("user_action", extra=log_data)
@@ -1,5 +1,243 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
+from apps.analytics.models import UserActivityLog
 
+from .authentication import CachedJWTAuthentication
+from .models import User
+from .views import LOGIN_FAILURE_LIMIT, LOGIN_FAILURE_WINDOW
+
+LOGIN_URL = '/authentication/auth/login/'
+LOGOUT_URL = '/authentication/auth/logout/'
+USERS_URL = '/authentication/auth/users/'
+
+# Sessions, login counters and cached users live in Redis, the tests run against a process-local cache
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# PBKDF2 makes every login in these tests take a few hundred milliseconds
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class UserLoginRateLimitTests(TestCase):
+    """Failed login counting in UserLoginView."""
+
+    password = 'correct-horse-42'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='darlene', email='darlene@example.com', password=cls.password,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _login(self, password, **data):
+        data.setdefault('identifier', self.user.username)
+        return self.client.post(LOGIN_URL, {**data, 'password': password}, format='json')
+
+    def _fail(self, times):
+        for _ in range(times):
+            self.assertEqual(self._login('wrong-password').status_code, 400)
+
+    def test_too_many_failures_are_rejected_before_checking_the_password(self):
+        self._fail(LOGIN_FAILURE_LIMIT)
+
+        response = self._login(self.password)
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_successful_login_clears_the_failures(self):
+        self._fail(LOGIN_FAILURE_LIMIT - 1)
+        self.assertEqual(self._login(self.password).status_code, 200)
+
+        # Without the reset these would push the counter past the limit
+        self._fail(LOGIN_FAILURE_LIMIT - 1)
+        self.assertEqual(self._login(self.password).status_code, 200)
+
+    def test_non_string_username_is_a_bad_request(self):
+        self.assertEqual(self._login('x', username=123, identifier=None).status_code, 400)
+        self.assertEqual(self._login('x', identifier=['darlene']).status_code, 400)
+
+    def test_failures_expire_with_the_window(self):
+        self._fail(LOGIN_FAILURE_LIMIT)
+
+        later = time.time() + LOGIN_FAILURE_WINDOW + 1
+        with mock.patch('time.time', return_value=later):
+            response = self._login(self.password)
+
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class CachedJWTAuthenticationTests(TestCase):
+    """The cached user handed to each request by CachedJWTAuthentication."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cached', email='cached@example.com', password='x')
+
+    def setUp(self):
+        cache.clear()
+        self.token = AccessToken.for_user(self.user)
+
+    def test_each_request_gets_its_own_copy_of_the_cached_user(self):
+        first = CachedJWTAuthentication().get_user(self.token)
+        first.first_name = 'Changed in place'
+
+        with self.assertNumQueries(0):
+            second = CachedJWTAuthentication().get_user(self.token)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.pk, self.user.pk)
+        self.assertEqual(second.first_name, '')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class UserProfileAccessTests(TestCase):
+    """Who can read which profile through UserProfileViewSet.retrieve."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        cls.other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        cls.staff = User.objects.create_user(
+            username='staff', email='staff@example.com', password='x', is_staff=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _get_profile(self, as_user, pk):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(as_user)}')
+        return self.client.get(f'{USERS_URL}{pk}/')
+
+    def test_user_can_read_their_own_profile(self):
+        response = self._get_profile(self.user, self.user.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], self.user.username)
+
+    def test_user_gets_403_for_another_profile(self):
+        self.assertEqual(self._get_profile(self.user, self.other.pk).status_code, 403)
+
+    def test_user_gets_403_for_a_missing_profile(self):
+        # The same answer as for an existing profile, so ids can't be probed
+        self.assertEqual(self._get_profile(self.user, self.other.pk + 1000).status_code, 403)
+
+    def test_staff_can_read_any_profile(self):
+        response = self._get_profile(self.staff, self.other.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], self.other.username)
+
+    def test_staff_gets_404_for_a_missing_profile(self):
+        self.assertEqual(self._get_profile(self.staff, self.other.pk + 1000).status_code, 404)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class UserLogoutTests(TestCase):
+    """Response of UserLogoutView."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='leaving', email='leaving@example.com', password='x')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_logout_answers_204_without_a_body(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+        response = self.client.post(LOGOUT_URL)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+
+    def test_logout_requires_authentication(self):
+        self.assertEqual(self.client.post(LOGOUT_URL).status_code, 401)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class StaffUserListTests(TestCase):
+    """The paginated user list UserProfileViewSet.list returns to staff."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            username='staff', email='staff@example.com', password='x', is_staff=True,
+        )
+        for i in range(24):
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', password='x')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.staff)}')
+
+    def test_first_page(self):
+        response = self.client.get(USERS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'users', 'count', 'next', 'previous', 'message'})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['users']), 20)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+        self.assertEqual(
+            set(response.data['users'][0]), {'id', 'username', 'email', 'first_name', 'last_name'},
+        )
+
+    def test_last_page(self):
+        response = self.client.get(USERS_URL, {'page': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['users']), 5)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS)
+class UserStatsTests(TestCase):
+    """The stats dict UserProfileViewSet.user_stats returns."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='counted', email='counted@example.com', password='x', last_login=timezone.now(),
+        )
+        for action_type in ['movie_view', 'movie_view', 'rating_submit', 'favorite_add', 'movie_search']:
+            UserActivityLog.log_activity(
+                action_type=action_type, session_id='session', ip_address='127.0.0.1',
+                user_agent='tests', source='web', user=cls.user,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_stats_are_returned(self):
+        response = self.client.get(f'{USERS_URL}stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'total_interactions': 5,
+            'movie_views': 2,
+            'ratings_given': 1,
+            'favorites_added': 1,
+            'account_age_days': 0,
+            'is_active_user': True,
+            'favorite_genres_count': 0,
+            'is_premium': False,
+        })
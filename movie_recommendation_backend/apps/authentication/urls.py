@@ -4,6 +4,7 @@ THis file is part of the movie recommendation backend project.
 This file contains the URL configuration for the authentication app.
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
@@ -33,8 +34,13 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path('token/verify/', TokenObtainPairView.as_view(), name='token-verify'),
     path('search/', UserSearchView.as_view(), name='user-search'),
-    path('debug/', UserDebugView.as_view(), name='user-debug'),
 
     # Include the router URLs
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# The debug endpoint only exists in development, production 404s at the resolver
+if settings.DEBUG:
+    urlpatterns += [
+        path('debug/', UserDebugView.as_view(), name='user-debug'),
+    ]
\ No newline at end of file
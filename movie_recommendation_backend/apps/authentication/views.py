@@ -6,18 +6,23 @@ It uses DRF and class based views for clean and readable code structure.
 The views handle, http requests, authentication, data validation, business logic execution and logging and monitoring
 """
 
-import json
 import logging
+import orjson
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.contrib.auth.models import update_last_login
 from django.db import transaction
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.http import Http404
 from django.shortcuts import get_object_or_404, render
+from django.views.decorators.cache import cache_page
 from django.contrib.auth import login, logout
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Greatest
+from django.contrib.postgres.search import TrigramSimilarity
 
 from rest_framework import status, permissions
 from rest_framework.response import Response
@@ -29,6 +34,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from .models import User
+from .authentication import invalidate_cached_user
 from .serializers import (
     LoginSerializer,
     UserProfileSerializer,
@@ -40,8 +46,16 @@ from .serializers import (
     UserStatsSerializer,
 )
 
-from ipware import get_client_ip
 from apps.notifications.tasks import send_welcome_email_task
+from .tasks import record_user_action_task
+
+# The analytics app is optional, resolve it once here instead of on every stats request
+try:
+    from apps.analytics.models import UserActivityLog
+    ANALYTICS_AVAILABLE = True
+except ImportError:
+    UserActivityLog = None
+    ANALYTICS_AVAILABLE = False
 
 # Configuration of logging
 logger = logging.getLogger(__name__)
@@ -49,90 +63,111 @@ logger = logging.getLogger(__name__)
 #Logger for user activity
 activity_logger = logging.getLogger('user_activity')
 
+# Failed logins allowed per (client IP, username) inside the window before login answers 429
+LOGIN_FAILURE_LIMIT = 10
+LOGIN_FAILURE_WINDOW = 60 * 5
+
+# A user who logged in within this window counts as active in user_stats
+ACTIVE_USER_WINDOW = timedelta(days=30)
+
+# How long (in seconds) a user_stats response is served from the cache
+USER_STATS_CACHE_TIMEOUT = 60 * 2
+
+# Model columns read by UserProfileSerializer, plus updated_at for the profile cache key.
+# The serializer's Meta.fields also holds computed fields, so it can't be passed to only().
+PROFILE_ONLY_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'date_of_birth', 'bio',
+    'avatar', 'country', 'preferred_timezone', 'preferred_language', 'phone_number',
+    'favorite_genres', 'is_active', 'is_staff', 'is_superuser', 'last_login',
+    'date_joined', 'device_type', 'updated_at',
+)
+
 # WEB INTERFACE VIEWS
-def auth_hub(request):
-    """Authentication app hub showing all available endpoints"""
+# The hub page is static, so its data is built once at import time
+# CORRECTED endpoints that match your actual URL patterns
+AUTH_HUB_ENDPOINTS_BY_SECTION = {
+    "🔐 AUTHENTICATION": [
+        {"method": "POST", "url": "/authentication/auth/register/", "description": "🆕 User registration - Create new account", "status": "✅ Active"},
+        {"method": "POST", "url": "/authentication/auth/login/", "description": "🔑 User login - Get JWT tokens", "status": "✅ Active"},
+        {"method": "POST", "url": "/authentication/auth/logout/", "description": "🚪 User logout - End session", "status": "✅ Active"},
+        {"method": "POST", "url": "/authentication/auth/token/refresh/", "description": "🔄 Refresh JWT token", "status": "✅ Active"},
+        {"method": "POST", "url": "/authentication/auth/token/verify/", "description": "✅ Verify JWT token", "status": "✅ Active"},
+    ],
     
-    # CORRECTED endpoints that match your actual URL patterns
-    endpoints_by_section = {
-        "🔐 AUTHENTICATION": [
-            {"method": "POST", "url": "/authentication/auth/register/", "description": "🆕 User registration - Create new account", "status": "✅ Active"},
-            {"method": "POST", "url": "/authentication/auth/login/", "description": "🔑 User login - Get JWT tokens", "status": "✅ Active"},
-            {"method": "POST", "url": "/authentication/auth/logout/", "description": "🚪 User logout - End session", "status": "✅ Active"},
-            {"method": "POST", "url": "/authentication/auth/token/refresh/", "description": "🔄 Refresh JWT token", "status": "✅ Active"},
-            {"method": "POST", "url": "/authentication/auth/token/verify/", "description": "✅ Verify JWT token", "status": "✅ Active"},
-        ],
-        
-        "👤 USER PROFILE MANAGEMENT": [
-            {"method": "GET", "url": "/authentication/auth/users/", "description": "👥 List users / Get current profile", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/auth/users/{id}/", "description": "🔍 Get specific user profile", "status": "✅ Active"},
-            {"method": "PUT", "url": "/authentication/auth/users/{id}/", "description": "✏️ Update user profile (full)", "status": "✅ Active"},
-            {"method": "PATCH", "url": "/authentication/auth/users/{id}/", "description": "📝 Update user profile (partial)", "status": "✅ Active"},
-            {"method": "DELETE", "url": "/authentication/auth/users/{id}/", "description": "🗑️ Deactivate user account", "status": "✅ Active"},
-        ],
-        
-        "🔧 USER ACTIONS": [
-            {"method": "POST", "url": "/authentication/auth/users/change-password/", "description": "🔒 Change password", "status": "✅ Active"},
-            {"method": "POST", "url": "/authentication/auth/users/update-device/", "description": "📱 Update device info", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/auth/users/stats/", "description": "📊 Get user statistics", "status": "✅ Active"},
-        ],
-        
-        "🔍 UTILITY ENDPOINTS": [
-            {"method": "GET", "url": "/authentication/auth/search/", "description": "🔎 Search users", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/auth/debug/", "description": "🐛 Debug info (dev only)", "status": "🟡 Dev Only"},
-        ],
-        
-        "📘 API DOCUMENTATION": [
-            {"method": "GET", "url": "/authentication/api/docs/", "description": "📖 Swagger UI documentation", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/api/redoc/", "description": "📋 ReDoc documentation", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/api/schema/", "description": "📄 JSON API schema", "status": "✅ Active"},
-        ],
-        
-        "🌐 WEB INTERFACE": [
-            {"method": "GET", "url": "/authentication/", "description": "🏠 Authentication hub (this page)", "status": "✅ Active"},
-            {"method": "GET", "url": "/authentication/admin/", "description": "⚙️ Django admin interface", "status": "✅ Active"},
-        ]
-    }
+    "👤 USER PROFILE MANAGEMENT": [
+        {"method": "GET", "url": "/authentication/auth/users/", "description": "👥 List users / Get current profile", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/auth/users/{id}/", "description": "🔍 Get specific user profile", "status": "✅ Active"},
+        {"method": "PUT", "url": "/authentication/auth/users/{id}/", "description": "✏️ Update user profile (full)", "status": "✅ Active"},
+        {"method": "PATCH", "url": "/authentication/auth/users/{id}/", "description": "📝 Update user profile (partial)", "status": "✅ Active"},
+        {"method": "DELETE", "url": "/authentication/auth/users/{id}/", "description": "🗑️ Deactivate user account", "status": "✅ Active"},
+    ],
     
-    # Flatten endpoints for template
-    flat_endpoints = []
-    for section_name, section_endpoints in endpoints_by_section.items():
-        for endpoint in section_endpoints:
-            endpoint['section'] = section_name
-            flat_endpoints.append(endpoint)
+    "🔧 USER ACTIONS": [
+        {"method": "POST", "url": "/authentication/auth/users/change-password/", "description": "🔒 Change password", "status": "✅ Active"},
+        {"method": "POST", "url": "/authentication/auth/users/update-device/", "description": "📱 Update device info", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/auth/users/stats/", "description": "📊 Get user statistics", "status": "✅ Active"},
+    ],
     
-    # Add usage examples
-    usage_examples = {
-        "🔑 Login Flow": [
-            "1. POST /authentication/auth/register/ - Create account",
-            "2. POST /authentication/auth/login/ - Get tokens", 
-            "3. GET /authentication/auth/users/ - Get your profile (with token)",
-            "4. PATCH /authentication/auth/users/{your_id}/ - Update profile"
-        ],
-        "📱 Profile Management": [
-            "1. GET /authentication/auth/users/ - See your profile",
-            "2. POST /authentication/auth/users/change-password/ - Change password",
-            "3. POST /authentication/auth/users/update-device/ - Update device info",
-            "4. GET /authentication/auth/users/stats/ - View your stats"
-        ],
-        "🔍 Search & Discovery": [
-            "1. GET /authentication/auth/search/?q=john - Search users",
-            "2. GET /authentication/auth/users/{id}/ - View other profiles",
-            "3. GET /authentication/auth/debug/ - Debug info (dev)"
-        ]
-    }
+    "🔍 UTILITY ENDPOINTS": [
+        {"method": "GET", "url": "/authentication/auth/search/", "description": "🔎 Search users", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/auth/debug/", "description": "🐛 Debug info (dev only)", "status": "🟡 Dev Only"},
+    ],
     
-    context = {
-        'app_name': '🔐 Authentication API Hub',
-        'app_description': 'JWT-based authentication system with comprehensive user management',
-        'endpoints_by_section': endpoints_by_section,
-        'flat_endpoints': flat_endpoints,
-        'usage_examples': usage_examples,
-        'total_endpoints': len(flat_endpoints),
-        'base_url': '/authentication/auth/',
-    }
+    "📘 API DOCUMENTATION": [
+        {"method": "GET", "url": "/authentication/api/docs/", "description": "📖 Swagger UI documentation", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/api/redoc/", "description": "📋 ReDoc documentation", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/api/schema/", "description": "📄 JSON API schema", "status": "✅ Active"},
+    ],
     
-    return render(request, 'authentication/auth_hub.html', context)
+    "🌐 WEB INTERFACE": [
+        {"method": "GET", "url": "/authentication/", "description": "🏠 Authentication hub (this page)", "status": "✅ Active"},
+        {"method": "GET", "url": "/authentication/admin/", "description": "⚙️ Django admin interface", "status": "✅ Active"},
+    ]
+}
+
+# Flatten endpoints for template
+AUTH_HUB_FLAT_ENDPOINTS = []
+for section_name, section_endpoints in AUTH_HUB_ENDPOINTS_BY_SECTION.items():
+    for endpoint in section_endpoints:
+        endpoint['section'] = section_name
+        AUTH_HUB_FLAT_ENDPOINTS.append(endpoint)
+
+# Add usage examples
+AUTH_HUB_USAGE_EXAMPLES = {
+    "🔑 Login Flow": [
+        "1. POST /authentication/auth/register/ - Create account",
+        "2. POST /authentication/auth/login/ - Get tokens", 
+        "3. GET /authentication/auth/users/ - Get your profile (with token)",
+        "4. PATCH /authentication/auth/users/{your_id}/ - Update profile"
+    ],
+    "📱 Profile Management": [
+        "1. GET /authentication/auth/users/ - See your profile",
+        "2. POST /authentication/auth/users/change-password/ - Change password",
+        "3. POST /authentication/auth/users/update-device/ - Update device info",
+        "4. GET /authentication/auth/users/stats/ - View your stats"
+    ],
+    "🔍 Search & Discovery": [
+        "1. GET /authentication/auth/search/?q=john - Search users",
+        "2. GET /authentication/auth/users/{id}/ - View other profiles",
+        "3. GET /authentication/auth/debug/ - Debug info (dev)"
+    ]
+}
+
+AUTH_HUB_CONTEXT = {
+    'app_name': '🔐 Authentication API Hub',
+    'app_description': 'JWT-based authentication system with comprehensive user management',
+    'endpoints_by_section': AUTH_HUB_ENDPOINTS_BY_SECTION,
+    'flat_endpoints': AUTH_HUB_FLAT_ENDPOINTS,
+    'usage_examples': AUTH_HUB_USAGE_EXAMPLES,
+    'total_endpoints': len(AUTH_HUB_FLAT_ENDPOINTS),
+    'base_url': '/authentication/auth/',
+}
+
+
+@cache_page(60 * 60 * 24)  # Static page, cache the rendered response for a day
+def auth_hub(request):
+    """Authentication app hub showing all available endpoints"""
+    return render(request, 'authentication/auth_hub.html', AUTH_HUB_CONTEXT)
 
 def safe_json_loads(value, default=None):
     """Safely parse JSON data that might already be parsed"""
@@ -142,48 +177,69 @@ def safe_json_loads(value, default=None):
         return value
     if isinstance(value, str) and value.strip():
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, ValueError):
+            return orjson.loads(value)
+        except (orjson.JSONDecodeError, ValueError):
             return default or []
     return default or []
 
+def profile_cache_key(user):
+    """Cache key of the user's serialized profile at its current updated_at."""
+    return f"user:profile:{user.id}:{user.updated_at.timestamp()}"
+
+def get_cached_profile(user, context=None):
+    """
+    Return UserProfileSerializer data for the user, cached in Redis.
+    The key contains updated_at (auto_now), so any save() of the user moves it to a new key.
+    """
+    return cache.get_or_set(
+        profile_cache_key(user),
+        lambda: UserProfileSerializer(user, context=context or {}).data,
+        timeout=60 * 60,
+    )
+
+def issue_tokens(user):
+    """
+    Mint the JWT pair for the user and return (access_token, refresh_token) as strings.
+    str() signs a token on every call, so each one is signed exactly once here.
+    """
+    refresh = RefreshToken.for_user(user)
+    return str(refresh.access_token), str(refresh)
+
 def log_user_action(user, action, details=None, request=None):
     """
     Utility function to log user actions consistently.
+    Only the record is built here, the activity log listener thread formats and writes it.
     """
+    # Skip building the record at all when activity logging is filtered out
+    if not activity_logger.isEnabledFor(logging.INFO):
+        return
+
     log_data = {
         'user_id': user.id if user else None,
         'username': user.username if user else None,
         'action': action,
         'details': details,
-        'timestamp': timezone.now().isoformat(),
     }
 
     # Add request metadata if available
     if request:
-        log_data['ip_address'] = get_client_ip(request)
+        log_data['ip_address'] = request.client_ip
         log_data['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
     else:
         # Set defaults when no request is provided
         log_data['ip_address'] = 'unknown'
         log_data['user_agent'] = 'unknown'
 
-    # Log this to the activity logger
-    activity_logger.info(
-        f"User Action: {log_data['action']} | User: {log_data['username']} | "
-        f"IP: {log_data['ip_address']} | User Agent: {log_data['user_agent']} | "
-        f"Timestamp: {log_data['timestamp']} | Details: {log_data['details']}"
-    )
-
-def get_client_ip(request):
-    """Get the client's IP address from the request."""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR', 'unknown')
-    return ip
+    if settings.ASYNC_ACTIVITY_LOG:
+        # Let a Celery worker write the record, fall back to the local listener if the broker is down
+        try:
+            record_user_action_task.delay(log_data)
+            return
+        except Exception as queue_error:
+            logger.error("Failed to queue user action log: %s", queue_error)
 
+    # The timestamp comes from the record itself (asctime in the user_activity formatter)
+    activity_logger.info("user_action", extra=log_data)
 
 class UserRegistrationView(APIView):
     """
@@ -202,67 +258,70 @@ class UserRegistrationView(APIView):
         """
         logger.info("User registration request received.")
         
-        serializer = UserRegistrationSerializer(data=request.data)
+        # Parse the body once, the name is reused in every log line below
+        data = request.data
+        username = data.get('username', 'unknown')
+        
+        serializer = UserRegistrationSerializer(data=data)
         
         if serializer.is_valid():
             try:
+                # Only the INSERT runs in the transaction, token signing, logging and
+                # the broker call happen after the commit
                 with transaction.atomic():
                     user = serializer.save()
-                    refresh = RefreshToken.for_user(user)
-                    access_token = str(refresh.access_token)
-                    
-                    # Update last login with timestamp
-                    user.last_login = timezone.now()
-                    user.save()
-                    
-                    # Log successful registration
-                    log_user_action(
-                        user=user,
-                        action='User Registration',
-                        details={
-                            'username': user.username,
-                            'email': user.email,
-                            'ip_address': get_client_ip(request),
-                            'favorite_genres_count': len(safe_json_loads(user.favorite_genres, [])),
-                            'created_at': user.date_joined.isoformat(),
-                        },
-                        request=request
-                    )
-                    
-                    # 🚀 SEND WELCOME EMAIL ASYNCHRONOUSLY
-                    try:
-                        send_welcome_email_task.delay(user.id)
-                        logger.info(f"Welcome email queued for user {user.username}")
-                    except Exception as email_error:
-                        # Don't fail registration if email fails
-                        logger.error(f"Failed to queue welcome email for {user.username}: {email_error}")
-                    
-                    # Prepare response data
-                    user_data = UserProfileSerializer(user).data
-                    
-                    logger.info(f"User {user.username} registered successfully.")
-                    return Response({
-                        'user': user_data,
-                        'access_token': access_token,
-                        'refresh_token': str(refresh),
-                        'message': 'Registration successful! Welcome email sent.'
-                    }, status=status.HTTP_201_CREATED)
-                    
+                
+                access_token, refresh_token = issue_tokens(user)
+                
+                # Log successful registration
+                log_user_action(
+                    user=user,
+                    action='User Registration',
+                    details={
+                        'username': user.username,
+                        'email': user.email,
+                        'ip_address': request.client_ip,
+                        'favorite_genres_count': len(user.favorite_genres or []),
+                        'created_at': user.date_joined.isoformat(),
+                    },
+                    request=request
+                )
+                
+                # 🚀 SEND WELCOME EMAIL ASYNCHRONOUSLY
+                # The user row is committed by now, so the worker can always load it
+                try:
+                    send_welcome_email_task.delay(user.id)
+                    logger.info("Welcome email queued for user %s", user.username)
+                except Exception as email_error:
+                    # Don't fail registration if email fails
+                    logger.error("Failed to queue welcome email for %s: %s", user.username, email_error)
+                
+                # Prepare response data
+                user_data = get_cached_profile(user, {'request': request})
+                
+                logger.info("User %s registered successfully.", user.username)
+                return Response({
+                    'user': user_data,
+                    'access_token': access_token,
+                    'refresh_token': refresh_token,
+                    'message': 'Registration successful! Welcome email sent.'
+                }, status=status.HTTP_201_CREATED)
+                
             except ValidationError as e:
-                logger.error(f"Registration failed for {request.data.get('username', 'unknown')}: {str(e)}")
+                logger.error("Registration failed for %s: %s", username, e)
                 return Response({
                     'error': 'Registration failed due to server error.'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 
         else:
-            logger.warning(f"Registration failed for {request.data.get('username', 'unknown')}: {serializer.errors}")
+            logger.warning("Registration failed for %s: %s", username, serializer.errors)
             log_user_action(
                 user=None,
                 action='User Registration Failed',
                 details={
-                    'username': request.data.get('username', 'unknown'),
+                    'username': username,
                     'errors': serializer.errors,
-                    'ip_address': get_client_ip(request),
+                    'ip_address': request.client_ip,
                 },
                 request=request
             )
@@ -289,19 +348,39 @@ class UserLoginView(APIView):
         
         logger.info("User login request received.")
         
-        serializer = LoginSerializer(data=request.data)
+        # Parse the body once, the name is reused in every log line below
+        # LoginSerializer takes 'identifier', older clients still send 'username'
+        data = request.data
+        username = data.get('username') or data.get('identifier') or 'unknown'
+        
+        # Reject repeated failures before paying for the user lookup and password hash.
+        # The body isn't validated yet, a non-string name still has to make a key (and a 400)
+        failure_key = f"login_failures:{request.client_ip}:{str(username).lower()}"
+        if (cache.get(failure_key) or 0) >= LOGIN_FAILURE_LIMIT:
+            logger.warning("Login rate limited for %s - %s", username, request.client_ip)
+            return Response({
+                'error': 'Too many failed login attempts. Please try again later.'
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        serializer = LoginSerializer(data=data)
 
         if serializer.is_valid():
             user = serializer.validated_data['user']
+            cache.delete(failure_key)
 
             try:
                 # Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
-                access_token = str(refresh.access_token)
+                access_token, refresh_token = issue_tokens(user)
                 
-                # Update last login timestamp
-                user.last_login = timezone.now()
-                user.save()
+                # Update last login timestamp with a single-column UPDATE
+                # instead of re-saving the whole row
+                user.last_login = user.updated_at = timezone.now()
+                User.objects.filter(pk=user.pk).update(
+                    last_login=user.last_login,
+                    updated_at=user.updated_at,  # Keeps cached profiles keyed on updated_at fresh
+                )
+                # update() skips post_save, so drop the cached JWT user ourselves
+                invalidate_cached_user(user.pk)
                 
                 # Log successful login
                 log_user_action(
@@ -310,42 +389,48 @@ class UserLoginView(APIView):
                     details={
                         'username': user.username,
                         'email': user.email,
-                        'ip_address': get_client_ip(request),
+                        'ip_address': request.client_ip,
                         'last_login': user.last_login.isoformat(),
                     },
                     request=request
                 )
                 
                 # Get user profile data
-                user_data = UserProfileSerializer(user).data
-                logger.info(f"User {user.username} logged in successfully.")
+                user_data = get_cached_profile(user, {'request': request})
+                logger.info("User %s logged in successfully.", user.username)
                 
                 return Response({
                     'user': user_data,
                     'tokens': {
                         'access_token': access_token,
-                        'refresh_token': str(refresh),
+                        'refresh_token': refresh_token,
                     },
                     'message': f'Welcome back, {user.username}'
                 }, status=status.HTTP_200_OK)
                 
             except Exception as e:
-                logger.error(f"Login failed for {request.data.get('username', 'unknown')}: {str(e)}")
+                logger.error("Login failed for %s: %s", username, e)
                 return Response({
                     'error': 'Login failed due to server error.',
                     'details': str(e) if settings.DEBUG else 'Please try again'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         else:
+            # Count the failure, the window starts at the first one
+            cache.add(failure_key, 0, LOGIN_FAILURE_WINDOW)
+            try:
+                cache.incr(failure_key)
+            except ValueError:
+                pass  # Key expired between add() and incr(), nothing left to count against
+            
             # Log failed login attempt
-            identifier = request.data.get('username', 'unknown')
-            logger.warning(f"Login failed for {identifier}: {serializer.errors} - {get_client_ip(request)}")
+            logger.warning("Login failed for %s: %s - %s", username, serializer.errors, request.client_ip)
             log_user_action(
                 user=None,
                 action='User Login Failed',
                 details={
-                    'username': request.data.get('username', 'unknown'),
+                    'username': username,
                     'errors': serializer.errors,
-                    'ip_address': get_client_ip(request),
+                    'ip_address': request.client_ip,
                 },
                 request=request
             )
@@ -370,7 +455,7 @@ class UserLogoutView(APIView):
         Only requires valid access token (in Authorization header).
         """
         try:
-            logger.info(f"User {request.user.username} logged out successfully.")
+            logger.info("User %s logged out successfully.", request.user.username)
             
             log_user_action(
                 user=request.user,
@@ -382,12 +467,11 @@ class UserLogoutView(APIView):
                 request=request
             )
             
-            return Response({
-                'message': 'You have been logged out successfully.'
-            }, status=status.HTTP_200_OK)
+            # Nothing to send back, the status code is enough
+            return Response(status=status.HTTP_204_NO_CONTENT)
             
         except Exception as e:
-            logger.error(f"Logout failed for {request.user.username}: {str(e)}")
+            logger.error("Logout failed for %s: %s", request.user.username, e)
             return Response({
                 'error': 'Logout failed due to server error.',
                 'details': str(e) if settings.DEBUG else 'Please try again'
@@ -408,15 +492,26 @@ class UserProfileViewSet(ModelViewSet):
         Return the queryset based on user permissions.
         """
         if self.request.user.is_staff:
-            return User.objects.all()
+            return User.objects.only(*PROFILE_ONLY_FIELDS)
         else:
             # Regular users can only access their own profile
-            return User.objects.filter(id=self.request.user.id)
+            return User.objects.filter(id=self.request.user.id).only(*PROFILE_ONLY_FIELDS)
     
     def get_object(self):
         """
         Get user object with permission checking.
         """
+        user = self.request.user
+        if not user.is_staff:
+            if str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)) != str(user.id):
+                raise PermissionDenied("You can only access your own profile")
+            # Reads can use the user JWT authentication already loaded, no extra SELECT. It may
+            # miss a change made through another worker for up to LOCAL_USER_CACHE_TIMEOUT
+            # seconds. Writes still reload the row so it is never saved back over newer data
+            if self.request.method in permissions.SAFE_METHODS:
+                self.check_object_permissions(self.request, user)
+                return user
+        
         obj = super().get_object()
         
         # Users can only access their own profile unless they're staff
@@ -446,25 +541,30 @@ class UserProfileViewSet(ModelViewSet):
         For staff users, returns list of all users.
         """
         if request.user.is_staff:
-            # Staff can see all users
-            users = self.get_queryset()
-            serializer = UserMinimalSerializer(users, many=True)
+            # Staff can see all users, one page at a time. The UserMinimalSerializer fields
+            # are plain columns, so rows come back as dicts without building User objects
+            users = User.objects.order_by('id').values(*UserMinimalSerializer.Meta.fields)
+            users_data = self.paginate_queryset(users)
+            # Total from the paginator's COUNT(*), not from loading every row
+            user_count = self.paginator.page.paginator.count
             
             log_user_action(
                 user=request.user,
                 action='User List Viewed',
-                details={'user_count': len(users), 'is_staff': True},
+                details={'user_count': user_count, 'is_staff': True},
                 request=request
             )
             
             return Response({
-                'users': serializer.data,
-                'count': len(serializer.data),
+                'users': users_data,
+                'count': user_count,
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
                 'message': 'User list retrieved successfully'
             }, status=status.HTTP_200_OK)
         else:
             # Regular users get their own profile
-            serializer = self.get_serializer(request.user)
+            profile_data = get_cached_profile(request.user, self.get_serializer_context())
             
             log_user_action(
                 user=request.user,
@@ -477,7 +577,7 @@ class UserProfileViewSet(ModelViewSet):
                 request=request
             )
             
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(profile_data, status=status.HTTP_200_OK)
     
     def retrieve(self, request, pk=None):
         """
@@ -485,7 +585,7 @@ class UserProfileViewSet(ModelViewSet):
         """
         try:
             user = self.get_object()
-            serializer = self.get_serializer(user)  # 🔧 FIXED: was get_serializer_class
+            profile_data = get_cached_profile(user, self.get_serializer_context())
             
             log_user_action(
                 user=request.user,
@@ -498,15 +598,19 @@ class UserProfileViewSet(ModelViewSet):
                 request=request
             )
             
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(profile_data, status=status.HTTP_200_OK)
             
         except PermissionDenied as e:
-            logger.warning(f"Unauthorized access attempt to user profile {pk} by {request.user.username}.")
+            logger.warning("Unauthorized access attempt to user profile %s by %s.", pk, request.user.username)
             return Response({
                 'error': str(e)
             }, status=status.HTTP_403_FORBIDDEN)
+        except Http404:
+            return Response({
+                'error': 'User not found'
+            }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Profile retrieval failed: {str(e)}")
+            logger.error("Profile retrieval failed: %s", e)
             return Response({
                 'error': 'Failed to retrieve profile'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -540,8 +644,12 @@ class UserProfileViewSet(ModelViewSet):
             )
             
             if serializer.is_valid():
+                # The save moves the profile to a new key, drop the old entry instead of
+                # leaving it in Redis until it expires
+                stale_profile_key = profile_cache_key(user)
                 with transaction.atomic():
                     updated_user = serializer.save()
+                    cache.delete(stale_profile_key)
                     
                     # Log profile update
                     log_user_action(
@@ -555,17 +663,16 @@ class UserProfileViewSet(ModelViewSet):
                         request=request
                     )
                     
-                    logger.info(f"User {updated_user.username} profile updated")
+                    logger.info("User %s profile updated", updated_user.username)
                     
                     # Return updated profile data
-                    response_serializer = UserProfileSerializer(updated_user)
                     return Response({
-                        'user': response_serializer.data,
+                        'user': get_cached_profile(updated_user, self.get_serializer_context()),
                         'message': 'Profile updated successfully'
                     }, status=status.HTTP_200_OK)
             
             else:
-                logger.warning(f"Profile update validation failed for {request.user.username}: {serializer.errors}")
+                logger.warning("Profile update validation failed for %s: %s", request.user.username, serializer.errors)
                 return Response({
                     'error': 'Validation failed',
                     'details': serializer.errors
@@ -576,7 +683,7 @@ class UserProfileViewSet(ModelViewSet):
                 'error': str(e)
             }, status=status.HTTP_403_FORBIDDEN)
         except Exception as e:
-            logger.error(f"Profile update failed for {request.user.username}: {str(e)}")
+            logger.error("Profile update failed for %s: %s", request.user.username, e)
             return Response({
                 'error': 'Profile update failed',
                 'details': str(e) if settings.DEBUG else 'Please try again'
@@ -593,34 +700,40 @@ class UserProfileViewSet(ModelViewSet):
         try:
             user = self.get_object()
             
-            with transaction.atomic():
-                # Deactivate instead of deleting (for data integrity)
-                user.is_active = False
-                user.save()
-                
-                # Log account deactivation
-                log_user_action(
-                    user=request.user,
-                    action='Account Deactivated',
-                    details={
-                        'deactivated_user_id': user.id,
-                        'reason': 'user_request'
-                    },
-                    request=request
-                )
-                
-                logger.info(f"User {user.username} deactivated their account")
-                
-                return Response({
-                    'message': 'Account deactivated successfully. You can reactivate by contacting support.'
-                }, status=status.HTTP_200_OK)
-                
+            # Deactivate instead of deleting (for data integrity)
+            # A targeted UPDATE of the changed columns instead of a full-row save
+            user.is_active = False
+            user.updated_at = timezone.now()
+            User.objects.filter(pk=user.pk).update(
+                is_active=False,
+                updated_at=user.updated_at,  # Moves the cached profile to a new key
+            )
+            # update() skips post_save, so drop the cached JWT user ourselves
+            invalidate_cached_user(user.pk)
+            
+            # Log account deactivation
+            log_user_action(
+                user=request.user,
+                action='Account Deactivated',
+                details={
+                    'deactivated_user_id': user.id,
+                    'reason': 'user_request'
+                },
+                request=request
+            )
+            
+            logger.info("User %s deactivated their account", user.username)
+            
+            return Response({
+                'message': 'Account deactivated successfully. You can reactivate by contacting support.'
+            }, status=status.HTTP_200_OK)
+            
         except PermissionDenied as e:
             return Response({
                 'error': str(e)
             }, status=status.HTTP_403_FORBIDDEN)
         except Exception as e:
-            logger.error(f"Account deactivation failed for {request.user.username}: {str(e)}")
+            logger.error("Account deactivation failed for %s: %s", request.user.username, e)
             return Response({
                 'error': 'Account deactivation failed',
                 'details': str(e) if settings.DEBUG else 'Please contact support'
@@ -649,31 +762,33 @@ class UserProfileViewSet(ModelViewSet):
         
         if serializer.is_valid():
             try:
-                with transaction.atomic():
-                    user = serializer.save()
-                    
-                    # Log password change
-                    log_user_action(
-                        user=user,
-                        action='Password Changed',
-                        request=request
-                    )
-                    
-                    logger.info(f"User {user.username} changed their password")
-                    
-                    return Response({
-                        'message': 'Password changed successfully'
-                    }, status=status.HTTP_200_OK)
-                    
+                stale_profile_key = profile_cache_key(request.user)
+                # A single UPDATE, autocommit already makes it atomic
+                user = serializer.save()
+                cache.delete(stale_profile_key)
+                
+                # Log password change
+                log_user_action(
+                    user=user,
+                    action='Password Changed',
+                    request=request
+                )
+                
+                logger.info("User %s changed their password", user.username)
+                
+                return Response({
+                    'message': 'Password changed successfully'
+                }, status=status.HTTP_200_OK)
+                
             except Exception as e:
-                logger.error(f"Password change failed for {request.user.username}: {str(e)}")
+                logger.error("Password change failed for %s: %s", request.user.username, e)
                 return Response({
                     'error': 'Password change failed',
                     'details': str(e) if settings.DEBUG else 'Please try again'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
         else:
-            logger.warning(f"Password change validation failed for {request.user.username}")
+            logger.warning("Password change validation failed for %s", request.user.username)
             return Response({
                 'error': 'Validation failed',
                 'details': serializer.errors
@@ -713,7 +828,7 @@ class UserProfileViewSet(ModelViewSet):
                     request=request
                 )
                 
-                logger.info(f"User {user.username} updated device info")
+                logger.info("User %s updated device info", user.username)
                 
                 return Response({
                     'message': 'Device information updated successfully',
@@ -722,7 +837,7 @@ class UserProfileViewSet(ModelViewSet):
                 }, status=status.HTTP_200_OK)
                 
             except Exception as e:
-                logger.error(f"Device update failed for {request.user.username}: {str(e)}")
+                logger.error("Device update failed for %s: %s", request.user.username, e)
                 return Response({
                     'error': 'Device update failed',
                     'details': str(e) if settings.DEBUG else 'Please try again'
@@ -744,35 +859,46 @@ class UserProfileViewSet(ModelViewSet):
         Returns statistics about user activity, preferences, etc.
         """
         user = request.user
+        now = timezone.now()
+        today = now.date()
         
         try:
-            # Calculate user statistics from analytics if available
-            try:
-                from apps.analytics.models import UserActivityLog
-                total_activities = UserActivityLog.objects.filter(user=user).count()
-                movie_views = UserActivityLog.objects.filter(user=user, action_type='movie_view').count()
-                ratings_given = UserActivityLog.objects.filter(user=user, action_type='rating_submit').count()
-                favorites_added = UserActivityLog.objects.filter(user=user, action_type='favorite_add').count()
-            except ImportError:
-                # Fallback if analytics app is not available
-                total_activities = 0
-                movie_views = 0
-                ratings_given = 0
-                favorites_added = 0
+            # The whole response is cached per user for a short time. The key carries a
+            # schema version, the day (account_age_days) and updated_at (last_login,
+            # favorite_genres), activity counts are allowed to lag by the TTL
+            cache_key = f"user_stats:v1:{user.id}:{today.isoformat()}:{user.updated_at.timestamp()}"
+            stats_data = cache.get(cache_key)
             
-            stats_data = {
-                'total_interactions': total_activities,
-                'movie_views': movie_views,
-                'ratings_given': ratings_given,
-                'favorites_added': favorites_added,
-                'account_age_days': (timezone.now().date() - user.date_joined.date()).days,
-                'is_active_user': user.last_login and user.last_login > timezone.now() - timedelta(days=30),
-                'favorite_genres_count': len(safe_json_loads(user.favorite_genres, [])),
-                'is_premium': getattr(user, 'is_premium', False),
-            }
-            
-            serializer = UserStatsSerializer(data=stats_data)
-            serializer.is_valid(raise_exception=True)
+            if stats_data is None:
+                # Calculate user statistics from analytics if available
+                if ANALYTICS_AVAILABLE:
+                    # One query with conditional counts instead of one COUNT per action type
+                    activity_counts = UserActivityLog.objects.filter(user=user).aggregate(
+                        total_activities=models.Count('id'),
+                        movie_views=models.Count('id', filter=models.Q(action_type='movie_view')),
+                        ratings_given=models.Count('id', filter=models.Q(action_type='rating_submit')),
+                        favorites_added=models.Count('id', filter=models.Q(action_type='favorite_add')),
+                    )
+                else:
+                    # Fallback if analytics app is not available
+                    activity_counts = {
+                        'total_activities': 0,
+                        'movie_views': 0,
+                        'ratings_given': 0,
+                        'favorites_added': 0,
+                    }
+                
+                stats_data = {
+                    'total_interactions': activity_counts['total_activities'],
+                    'movie_views': activity_counts['movie_views'],
+                    'ratings_given': activity_counts['ratings_given'],
+                    'favorites_added': activity_counts['favorites_added'],
+                    'account_age_days': (today - user.date_joined.date()).days,
+                    'is_active_user': bool(user.last_login and user.last_login > now - ACTIVE_USER_WINDOW),
+                    'favorite_genres_count': len(safe_json_loads(user.favorite_genres, [])),
+                    'is_premium': user.is_premium,
+                }
+                cache.set(cache_key, stats_data, USER_STATS_CACHE_TIMEOUT)
             
             # Log stats viewing
             log_user_action(
@@ -781,12 +907,13 @@ class UserProfileViewSet(ModelViewSet):
                 request=request
             )
             
-            logger.info(f"User {user.username} viewed their stats")
+            logger.info("User %s viewed their stats", user.username)
             
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            # stats_data is built right here, no need to validate and re-serialize it
+            return Response(stats_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Stats retrieval failed for {request.user.username}: {str(e)}")
+            logger.error("Stats retrieval failed for %s: %s", request.user.username, e)
             return Response({
                 'error': 'Stats retrieval failed',
                 'details': str(e) if settings.DEBUG else 'Please try again'
@@ -818,34 +945,43 @@ class UserSearchView(APIView):
         
         try:
             # Search in username, first_name, last_name
-            users = User.objects.filter(
+            # The icontains filters are served by the pg_trgm GIN indexes on the User model,
+            # matches are ranked by their best trigram similarity to the query.
+            # Fetch the UserMinimalSerializer fields as plain dicts, they are all read-only
+            # model columns so the rows can be returned without building model instances
+            users = list(User.objects.filter(
                 models.Q(username__icontains=query) |
                 models.Q(first_name__icontains=query) |
                 models.Q(last_name__icontains=query),
                 is_active=True  # Only show active users
-            )[:10]  # Limit to 10 results
-            
-            serializer = UserMinimalSerializer(users, many=True)
+            ).annotate(
+                similarity=Greatest(
+                    TrigramSimilarity('username', query),
+                    TrigramSimilarity('first_name', query),
+                    TrigramSimilarity('last_name', query),
+                )
+            ).order_by('-similarity').values(*UserMinimalSerializer.Meta.fields)[:10])  # Limit to 10 results
+            results_count = len(users)
             
             # Log search action
             log_user_action(
                 user=request.user,
                 action='User Search',
-                details={'query': query, 'results_count': len(users)},
+                details={'query': query, 'results_count': results_count},
                 request=request
             )
             
-            logger.info(f"User {request.user.username} searched for '{query}' - {len(users)} results")
+            logger.info("User %s searched for '%s' - %s results", request.user.username, query, results_count)
             
             return Response({
-                'results': serializer.data,
-                'count': len(users),
+                'results': users,
+                'count': results_count,
                 'query': query,
-                'message': f'Found {len(users)} users matching "{query}"'
+                'message': f'Found {results_count} users matching "{query}"'
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"User search failed: {str(e)}")
+            logger.error("User search failed: %s", e)
             return Response({
                 'error': 'Search failed',
                 'details': str(e) if settings.DEBUG else 'Please try again'
@@ -862,13 +998,16 @@ class UserDebugView(APIView):
     """
     
     permission_classes = [IsAuthenticated]
+    # Read once at import time, settings don't change while the process runs
+    DEBUG_ENABLED = settings.DEBUG
+    LANGUAGE_CODE = settings.LANGUAGE_CODE
     
     def get(self, request):
         """
         Return debug information about the current user.
         """
         # Only allow in DEBUG mode
-        if not settings.DEBUG:
+        if not self.DEBUG_ENABLED:
             return Response({
                 'error': 'Debug endpoints are disabled in production'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -890,40 +1029,40 @@ class UserDebugView(APIView):
                 'profile_info': {
                     'first_name': user.first_name,
                     'last_name': user.last_name,
-                    'phone_number': getattr(user, 'phone_number', None),
-                    'country': getattr(user, 'country', None),
-                    'preferred_language': getattr(user, 'preferred_language', None),
-                    'favorite_genres': safe_json_loads(getattr(user, 'favorite_genres', None), []),
-                    'is_premium': getattr(user, 'is_premium', False),
+                    'phone_number': user.phone_number,
+                    'country': user.country,
+                    'preferred_language': user.preferred_language,
+                    'favorite_genres': safe_json_loads(user.favorite_genres, []),
+                    'is_premium': user.is_premium,
                 },
                 'device_info': {
-                    'device_type': getattr(user, 'device_type', None),
-                    'has_device_token': bool(getattr(user, 'device_token', None)),
+                    'device_type': user.device_type,
+                    'has_device_token': bool(user.device_token),
                 },
                 'request_info': {
-                    'ip_address': get_client_ip(request),
+                    'ip_address': request.client_ip,
                     'user_agent': request.META.get('HTTP_USER_AGENT', ''),
                     'method': request.method,
                     'path': request.path,
                     'timestamp': timezone.now().isoformat(),
                 },
                 'system_info': {
-                    'django_debug': settings.DEBUG,
+                    'django_debug': self.DEBUG_ENABLED,
+                    # The current timezone can be activated per request, so it is read every time
                     'timezone': str(timezone.get_current_timezone()),
-                    'language_code': getattr(settings, 'LANGUAGE_CODE', 'en'),
+                    'language_code': self.LANGUAGE_CODE,
                 }
             }
             
             # Add analytics info if available
-            try:
-                from apps.analytics.models import UserActivityLog
+            if ANALYTICS_AVAILABLE:
                 recent_activities = UserActivityLog.objects.filter(
                     user=user
                 ).order_by('-timestamp')[:5].values(
                     'action_type', 'timestamp', 'source'
                 )
                 debug_data['recent_activities'] = list(recent_activities)
-            except ImportError:
+            else:
                 debug_data['recent_activities'] = 'Analytics app not available'
             
             # Log debug access
@@ -934,7 +1073,7 @@ class UserDebugView(APIView):
                 request=request
             )
             
-            logger.info(f"Debug info accessed by {user.username}")
+            logger.info("Debug info accessed by %s", user.username)
 
             return Response({
                 'debug_data': debug_data,
@@ -943,7 +1082,7 @@ class UserDebugView(APIView):
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Debug info retrieval failed for {user.username}: {str(e)}")
+            logger.error("Debug info retrieval failed for %s: %s", user.username, e)
             return Response({
                 'error': 'Failed to retrieve debug information',
                 'details': str(e) if settings.DEBUG else 'Please try again'
@@ -952,6 +1091,24 @@ class UserDebugView(APIView):
 
 # HELPER VIEW FOR PROFILE ACCESS GUIDANCE
 
+# Only the user info and the profile link depend on the request, the rest is built once
+PROFILE_HELP_STATIC = {
+    "message": "User Profile Access Guide",
+    "your_profile": {
+        "description": "To access your own profile, use the users endpoint",
+        "endpoints": {
+            "GET /authentication/auth/users/": "List users (shows your profile if authenticated)",
+            "GET /authentication/auth/users/{your_id}/": "Get your specific profile", 
+            "PATCH /authentication/auth/users/{your_id}/": "Update your profile",
+        }
+    },
+    "authentication": {
+        "description": "Include your JWT token in the Authorization header",
+        "header": "Authorization: Bearer your_jwt_token_here",
+        "how_to_get_token": "POST to /authentication/auth/login/ with username/password"
+    },
+}
+
 class UserProfileHelpView(APIView):
     """
     Helper view that explains how to access user profile endpoints
@@ -961,21 +1118,7 @@ class UserProfileHelpView(APIView):
     
     def get(self, request):
         """Provide help for profile access"""
-        help_info = {
-            "message": "User Profile Access Guide",
-            "your_profile": {
-                "description": "To access your own profile, use the users endpoint",
-                "endpoints": {
-                    "GET /authentication/auth/users/": "List users (shows your profile if authenticated)",
-                    "GET /authentication/auth/users/{your_id}/": "Get your specific profile", 
-                    "PATCH /authentication/auth/users/{your_id}/": "Update your profile",
-                }
-            },
-            "authentication": {
-                "description": "Include your JWT token in the Authorization header",
-                "header": "Authorization: Bearer your_jwt_token_here",
-                "how_to_get_token": "POST to /authentication/auth/login/ with username/password"
-            },
+        help_info = PROFILE_HELP_STATIC | {
             "current_user_info": {
                 "authenticated": request.user.is_authenticated,
                 "user_id": request.user.id if request.user.is_authenticated else None,
@@ -1,11 +1,12 @@
 from django.contrib import admin
-from django.utils.html import format_html, mark_safe
+from django.utils.html import format_html, format_html_join, mark_safe
 from django.urls import reverse
 from django.utils.safestring import SafeString
 from django.db.models import Count, Avg
+from django.contrib.postgres.aggregates import StringAgg
 from django.forms import widgets
 from django import forms
-import json
+import orjson
 from .models import Genre, Movie, MovieGenre
 
 # Custom Widgets and Forms
@@ -22,12 +23,12 @@ class JsonTextareaWidget(widgets.Textarea):
                 # ✅ FIXED: Handle both already-parsed data and JSON strings
                 if isinstance(value, (list, dict)):
                     # Already parsed - just format it nicely
-                    return json.dumps(value, indent=2, ensure_ascii=False)
+                    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
                 elif isinstance(value, str):
                     # String - try to parse it and format nicely
-                    parsed = json.loads(value)
-                    return json.dumps(parsed, indent=2, ensure_ascii=False)
-            except (json.JSONDecodeError, TypeError):
+                    parsed = orjson.loads(value)
+                    return orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode()
+            except (orjson.JSONDecodeError, TypeError):
                 pass
         return value
 
@@ -72,7 +73,7 @@ class MovieAdminForm(forms.ModelForm):
                     parsed = value
                 elif isinstance(value, str):
                     # String - try to parse as JSON
-                    parsed = json.loads(value)
+                    parsed = orjson.loads(value)
                 else:
                     # Other types - handle gracefully
                     raise forms.ValidationError("Invalid data type for main cast.")
@@ -88,7 +89,7 @@ class MovieAdminForm(forms.ModelForm):
                 # Return as list - JSONField will handle serialization
                 return parsed
                 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 raise forms.ValidationError("Invalid JSON format.")
         return value
     
@@ -166,7 +167,8 @@ class GenreAdmin(admin.ModelAdmin):
         Custom method to display the number of movies per genre.
         This helps admins see which genres are most popular.
         """
-        count = obj.movies.count()
+        # Annotated in get_queryset, obj.movies.count() would run one COUNT per row
+        count = getattr(obj, 'movie_count', 0)
         if count > 0:
             # Create a link to filtered movie list
             url = reverse('admin:movies_movie_changelist') + f'?genres__id__exact={obj.id}'
@@ -187,6 +189,9 @@ class GenreAdmin(admin.ModelAdmin):
 
 # Movie Admin
 
+# Joins the aggregated genre names for the changelist, TMDB genre names never contain it
+GENRE_NAMES_SEPARATOR = '|'
+
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
     """
@@ -299,7 +304,6 @@ class MovieAdmin(admin.ModelAdmin):
     
     # PERFORMANCE OPTIMIZATION
     list_per_page = 25
-    prefetch_related = ['genres'] 
     
     # ORDERING
     ordering = ['-created_at']  # Newest first
@@ -358,20 +362,20 @@ class MovieAdmin(admin.ModelAdmin):
     
     def genre_list(self, obj):
         """Display associated genres as badges."""
-        genres = obj.genres.all()[:3]  # Limit to first 3 genres
-        if genres:
-            genre_badges = []
-            for genre in genres:
-                genre_badges.append(
-                    f'<span style="background: #007cba; color: white; padding: 2px 6px; border-radius: 3px; font-size: 11px; margin-right: 2px;">{genre.name}</span>'
-                )
+        # _genre_names and _genre_count come from the annotation in get_queryset
+        if obj._genre_names:
+            genre_names = obj._genre_names.split(GENRE_NAMES_SEPARATOR)[:3]  # Limit to first 3 genres
+            genre_badges = format_html_join(
+                '',
+                '<span style="background: #007cba; color: white; padding: 2px 6px; border-radius: 3px; font-size: 11px; margin-right: 2px;">{}</span>',
+                ((name,) for name in genre_names)
+            )
             
             # Add "..." if there are more genres
-            total_count = obj.genres.count()
-            if total_count > 3:
-                genre_badges.append(f'<span style="color: #666;">+{total_count - 3} more</span>')
+            if obj._genre_count > 3:
+                return format_html('{}<span style="color: #666;">+{} more</span>', genre_badges, obj._genre_count - 3)
             
-            return format_html(''.join(genre_badges))
+            return genre_badges
         return '-'
     
     genre_list.short_description = 'Genres'
@@ -430,9 +434,15 @@ class MovieAdmin(admin.ModelAdmin):
     reset_view_counts.short_description = 'Reset view counts for selected movies'
     # Queryset Optimization
     def get_queryset(self, request):
-        """Optimize queryset to prevent N+1 queries."""
-        queryset = super().get_queryset(request)
-        queryset = queryset.prefetch_related('genres')
+        """
+        Optimize queryset to prevent N+1 queries.
+        The genre names and count for genre_list are aggregated in the changelist query itself.
+        """
+        queryset = super().get_queryset(request).defer('search_vector')
+        queryset = queryset.annotate(
+            _genre_names=StringAgg('genres__name', GENRE_NAMES_SEPARATOR, distinct=True, order_by='genres__name'),
+            _genre_count=Count('genres', distinct=True),
+        )
         return queryset
 
 # Movie Genre Admin
@@ -449,7 +459,19 @@ class MovieGenreAdmin(admin.ModelAdmin):
     
     # Enable autocomplete for better UX
     autocomplete_fields = ['movie', 'genre']
-    
+
+    def get_queryset(self, request):
+        """
+        Join movie and genre for the display columns instead of two queries per row.
+        Only the columns those methods read are fetched from the joined tables.
+        """
+        queryset = super().get_queryset(request)
+        return queryset.select_related('movie', 'genre').only(
+            'id', 'movie', 'genre',
+            'movie__title', 'movie__release_date', 'movie__tmdb_rating',
+            'genre__name',
+        )
+
     # Custom display methods
     def movie_title(self, obj):
         return obj.movie.title
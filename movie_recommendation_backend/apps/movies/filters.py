@@ -4,8 +4,14 @@ Provides advanced filtering capabilities for movies.
 """
 
 import django_filters
-from django.db.models import Q
-from .models import Movie, Genre
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Exists, OuterRef, Q, TextField
+from django.db.models.functions import Cast
+from .models import Movie, Genre, MovieGenre
+
+# Genres for the genre/genres filters. Only touched when the parameter is passed (a pk
+# lookup to validate it) or the browsable API renders the filter form, which needs the name
+GENRE_CHOICES = Genre.objects.only('id', 'name')
 
 
 class MovieFilter(django_filters.FilterSet):
@@ -44,7 +50,7 @@ class MovieFilter(django_filters.FilterSet):
     # Genre filters
     genre = django_filters.ModelChoiceFilter(
         field_name='genres',
-        queryset=Genre.objects.all(),
+        queryset=GENRE_CHOICES,
         help_text="Filter by genre"
     )
     genre_name = django_filters.CharFilter(
@@ -54,7 +60,8 @@ class MovieFilter(django_filters.FilterSet):
     )
     genres = django_filters.ModelMultipleChoiceFilter(
         field_name='genres',
-        queryset=Genre.objects.all(),
+        method='filter_genres',
+        queryset=GENRE_CHOICES,
         help_text="Filter by multiple genres (OR logic)"
     )
     
@@ -62,14 +69,12 @@ class MovieFilter(django_filters.FilterSet):
     adult = django_filters.BooleanFilter(help_text="Filter adult content (true/false)")
     has_poster = django_filters.BooleanFilter(
         field_name='poster_path',
-        lookup_expr='isnull',
-        exclude=True,
+        method='filter_has_image',
         help_text="Movies with poster images"
     )
     has_backdrop = django_filters.BooleanFilter(
         field_name='backdrop_path',
-        lookup_expr='isnull',
-        exclude=True,
+        method='filter_has_image',
         help_text="Movies with backdrop images"
     )
     
@@ -82,7 +87,7 @@ class MovieFilter(django_filters.FilterSet):
     # Search across multiple fields
     search = django_filters.CharFilter(
         method='filter_by_search',
-        help_text="Search across title, overview, and director"
+        help_text="Full text search across title, original title, director, tagline and overview"
     )
     
     # Custom range filters
@@ -92,6 +97,7 @@ class MovieFilter(django_filters.FilterSet):
     )
     year_range = django_filters.RangeFilter(
         field_name='release_date__year',
+        method='filter_by_year_range',
         help_text="Release year range (e.g., 2020,2023)"
     )
     
@@ -107,25 +113,54 @@ class MovieFilter(django_filters.FilterSet):
         if not value:
             return queryset
         
-        # This uses PostgreSQL's JSON operators. For other databases, you might need different approach
-        return queryset.extra(
-            where=["main_cast::text ILIKE %s"],
-            params=[f'%{value}%']
-        )
+        # Substring match on the JSON text, served by the trigram index on UPPER(main_cast::text)
+        return queryset.alias(
+            main_cast_text=Cast('main_cast', TextField())
+        ).filter(main_cast_text__icontains=value)
+    
+    def filter_genres(self, queryset, name, value):
+        """Filter movies in any of the selected genres."""
+        # Without ?genres= the form field still cleans to an empty queryset, which isn't in
+        # django-filter's EMPTY_VALUES, so the method runs and has to leave the list alone
+        if not value:
+            return queryset
+        # EXISTS matches each movie once, no join over movie_genres and DISTINCT over the result
+        in_genres = MovieGenre.objects.filter(movie=OuterRef('pk'), genre__in=value)
+        return queryset.filter(Exists(in_genres))
+    
+    def filter_has_image(self, queryset, name, value):
+        """
+        Filter movies with (true) or without (false) a poster/backdrop.
+        The path columns aren't nullable, a missing image is stored as ''. Movies without one
+        are found through the partial indexes on Movie.
+        """
+        missing = Q(**{name: ''})
+        if value:
+            return queryset.exclude(missing)
+        return queryset.filter(missing)
+    
+    def filter_by_year_range(self, queryset, name, value):
+        """
+        Filter movies released within a range of years.
+        __year__range compiles to EXTRACT(YEAR FROM release_date), which can't use the index on
+        release_date. __year__gte/__year__lte are turned into plain date bounds that can.
+        """
+        if value.start is not None:
+            queryset = queryset.filter(release_date__year__gte=value.start)
+        if value.stop is not None:
+            queryset = queryset.filter(release_date__year__lte=value.stop)
+        return queryset
     
     def filter_by_search(self, queryset, name, value):
         """
-        Search across multiple fields using OR logic.
+        Full text search across title, original title, director, tagline and overview.
+        Matches whole words (with english stemming) through the GIN index on search_vector.
         """
         if not value:
             return queryset
         
         return queryset.filter(
-            Q(title__icontains=value) |
-            Q(original_title__icontains=value) |
-            Q(overview__icontains=value) |
-            Q(director__icontains=value) |
-            Q(tagline__icontains=value)
+            search_vector=SearchQuery(value, config='english', search_type='websearch')
         )
 
 
@@ -149,9 +184,11 @@ class GenreFilter(django_filters.FilterSet):
     
     def filter_has_movies(self, queryset, name, value):
         """Filter genres that have associated movies."""
+        # EXISTS stops at the first movie_genres row, no join and DISTINCT over every movie
+        has_movies = Exists(MovieGenre.objects.filter(genre=OuterRef('pk')))
         if value:
-            return queryset.filter(movies__isnull=False).distinct()
-        return queryset.filter(movies__isnull=True)
+            return queryset.filter(has_movies)
+        return queryset.filter(~has_movies)
     
     def filter_movie_count_gte(self, queryset, name, value):
         """Filter genres with at least the specified number of movies."""
@@ -69,7 +69,7 @@ class Command(BaseCommand):
                 # Show existing genres
                 if options['verbose']:
                     self.stdout.write('\nExisting genres:')
-                    for genre in Genre.objects.all()[:10]:
+                    for genre in Genre.objects.only('name', 'tmdb_id')[:10]:
                         self.stdout.write(f'  • {genre.name} (TMDB ID: {genre.tmdb_id})')
                     
                     if existing_count > 10:
@@ -117,7 +117,7 @@ class Command(BaseCommand):
             # Show some synced genres
             if options['verbose'] and genres_synced > 0:
                 self.stdout.write('\nGenres in database:')
-                for genre in Genre.objects.all()[:10]:
+                for genre in Genre.objects.only('name')[:10]:
                     self.stdout.write(f'  • {genre.name}')
                 
                 total_count = Genre.objects.count()
@@ -132,7 +132,7 @@ class Command(BaseCommand):
                 
                 if options['verbose']:
                     # Show sample existing movies
-                    sample_movies = Movie.objects.order_by('-popularity_score')[:5]
+                    sample_movies = Movie.objects.only('title', 'release_date', 'tmdb_rating').order_by('-popularity_score')[:5]
                     self.stdout.write('\n📊 Top existing movies:')
                     for movie in sample_movies:
                         rating = f"⭐ {movie.tmdb_rating}" if movie.tmdb_rating else "No rating"
@@ -317,13 +317,18 @@ class Command(BaseCommand):
     def _show_sample_movies(self):
         """Show a sample of newly seeded movies."""
         try:
-            from apps.movies.models import Movie
+            from django.db.models import Prefetch
+            from apps.movies.models import Movie, Genre
             
-            recent_movies = Movie.objects.order_by('-created_at')[:5]
+            # Genres of all five movies in one query, genre_names reads the prefetched rows
+            recent_movies = Movie.objects.only('title', 'release_date', 'tmdb_rating').prefetch_related(
+                Prefetch('genres', queryset=Genre.objects.only('id', 'name'))
+            ).order_by('-created_at')[:5]
             
             self.stdout.write('\n🎬 Sample of newly added movies:')
             for movie in recent_movies:
-                genres = ', '.join(movie.genre_names[:3]) if movie.genre_names else 'No genres'
+                genre_names = movie.genre_names
+                genres = ', '.join(genre_names[:3]) if genre_names else 'No genres'
                 rating = f"⭐ {movie.tmdb_rating}" if movie.tmdb_rating else "No rating"
                 self.stdout.write(f'  • {movie.title} ({movie.year}) - {rating} - {genres}')
         
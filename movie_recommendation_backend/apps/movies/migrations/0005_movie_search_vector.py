@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:24
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction, the GIN build is the slow part on a large catalog
+    atomic = False
+
+    dependencies = [
+        ('movies', '0004_alter_movie_omdb_rating_alter_movie_our_rating_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('original_title', 'director', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('tagline', 'overview', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), help_text='Weighted tsvector of the title, original title, director, tagline and overview', output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        AddIndexConcurrently(
+            model_name='movie',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_movies_search_vector'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:25
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction, it keeps the movies table writable
+    atomic = False
+
+    dependencies = [
+        ('movies', '0005_movie_search_vector'),
+    ]
+
+    operations = [
+        # Already created for the user search, a no-op unless this app is migrated first
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='movie',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('main_cast', models.TextField())), name='gin_trgm_ops'), name='idx_movies_main_cast_trgm'),
+        ),
+    ]
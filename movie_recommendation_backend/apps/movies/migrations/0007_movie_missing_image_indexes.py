@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:28
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction, it keeps the movies table writable
+    atomic = False
+
+    dependencies = [
+        ('movies', '0006_movie_main_cast_trigram_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('poster_path', '')), fields=['id'], name='idx_movies_no_poster'),
+        ),
+        AddIndexConcurrently(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('backdrop_path', '')), fields=['id'], name='idx_movies_no_backdrop'),
+        ),
+    ]
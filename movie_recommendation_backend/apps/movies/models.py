@@ -8,11 +8,14 @@ and a custom manager for querying movies.
 
 import json
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 from django.utils import timezone
 from django.db.models import F
+from django.db.models.functions import Cast, Upper
 from datetime import timedelta, date
 
 
@@ -112,6 +115,18 @@ class Movie(models.Model):
     # Relationships
     genres = models.ManyToManyField(Genre, through='MovieGenre', related_name='movies', blank=True, verbose_name="Genres", help_text="The genres associated with the movie")
 
+    # Full text search document, kept up to date by Postgres on every write (including bulk ones)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('original_title', 'director', weight='B', config='english')
+            + SearchVector('tagline', 'overview', weight='C', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Weighted tsvector of the title, original title, director, tagline and overview",
+    )
+
     class Meta:
         db_table = 'movies'
         verbose_name = "Movie"
@@ -129,6 +144,12 @@ class Movie(models.Model):
             models.Index(fields=['original_language'], name='idx_movies_original_language'),
             models.Index(fields=['adult'], name='idx_movies_adult'),
             models.Index(fields=['created_at'], name='idx_movies_created_at'),
+            GinIndex(fields=['search_vector'], name='idx_movies_search_vector'),
+            # Few movies lack images, index just those for has_poster/has_backdrop=false
+            models.Index(fields=['id'], condition=models.Q(poster_path=''), name='idx_movies_no_poster'),
+            models.Index(fields=['id'], condition=models.Q(backdrop_path=''), name='idx_movies_no_backdrop'),
+            # Trigram index for the cast_member filter, which matches UPPER(main_cast::text) LIKE UPPER('%name%')
+            GinIndex(OpClass(Upper(Cast('main_cast', models.TextField())), name='gin_trgm_ops'), name='idx_movies_main_cast_trgm'),
         ]
 
 
@@ -44,9 +44,8 @@ class MovieListSerializer(serializers.ModelSerializer):
         Return a list of genre names for this movie
         """
         try:
-            # Since you have genres = GenreSerializer(many=True), 
-            # this means obj.genres is a ManyToMany relationship
-            return list(obj.genres.values_list('name', flat=True))
+            # Read the prefetched genres, values_list() would run a query per movie
+            return [genre.name for genre in obj.genres.all()]
         except Exception as e:
             # Fallback in case of any errors
             import logging
@@ -1,3 +1,101 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from services.movie_data_service import MovieDataService
+
+from .models import Genre, Movie, MovieGenre
+
+MOVIE_LIST_URL = '/movies/api/movies/'
+
+# Sessions and the view caches live in Redis, the tests run against a process-local cache
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MovieListGenresFilterTests(TestCase):
+    """The movie list with and without the ?genres= filter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.action = Genre.objects.create(tmdb_id=28, name='Action')
+        cls.comedy = Genre.objects.create(tmdb_id=35, name='Comedy')
+        cls.drama = Genre.objects.create(tmdb_id=18, name='Drama')
+
+        cls.both = cls._create_movie(1, 'Action Comedy', [cls.action, cls.comedy])
+        cls.action_only = cls._create_movie(2, 'Action Only', [cls.action])
+        cls.drama_only = cls._create_movie(3, 'Drama Only', [cls.drama])
+
+    @staticmethod
+    def _create_movie(tmdb_id, title, genres):
+        movie = Movie.objects.create(
+            tmdb_id=tmdb_id, title=title, original_title=title,
+            tmdb_rating=7.0, release_date=date(2020, 1, tmdb_id),
+        )
+        for genre in genres:
+            MovieGenre.objects.create(movie=movie, genre=genre)
+        return movie
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_unfiltered_list_returns_every_movie(self):
+        response = self.client.get(MOVIE_LIST_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertCountEqual(
+            [movie['id'] for movie in response.data['results']],
+            [self.both.id, self.action_only.id, self.drama_only.id],
+        )
+
+    def test_genres_filter_returns_each_matching_movie_once(self):
+        response = self.client.get(MOVIE_LIST_URL, {'genres': [self.action.id, self.comedy.id]})
+
+        self.assertEqual(response.status_code, 200)
+        ids = [movie['id'] for movie in response.data['results']]
+        # The Action Comedy movie matches both genres but is listed once
+        self.assertCountEqual(ids, [self.both.id, self.action_only.id])
+        self.assertEqual(response.data['count'], 2)
+
+
+# The sync never calls the APIs, the services only refuse to start without a key
+@override_settings(TMDB_API_KEY='test', OMDB_API_KEY='test')
+class SyncMoviesToDatabaseTests(TestCase):
+    """Movies written by MovieDataService.sync_movies_to_database."""
+
+    def setUp(self):
+        self.service = MovieDataService()
+
+    @staticmethod
+    def _tmdb_movie(tmdb_id, title, vote_average):
+        return {'id': tmdb_id, 'title': title, 'original_title': title, 'vote_average': vote_average}
+
+    def test_new_movie_gets_our_rating_from_its_tmdb_rating(self):
+        stats = self.service.sync_movies_to_database([self._tmdb_movie(550, 'Fight Club', 8.4)])
+
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(Movie.objects.get(tmdb_id=550).our_rating, 4.2)
+
+    def test_existing_our_rating_is_kept(self):
+        Movie.objects.create(tmdb_id=550, title='Fight Club', original_title='Fight Club',
+                             tmdb_rating=8.4, our_rating=9.0)
+
+        stats = self.service.sync_movies_to_database([self._tmdb_movie(550, 'Fight Club', 8.6)])
+
+        self.assertEqual(stats['updated'], 1)
+        movie = Movie.objects.get(tmdb_id=550)
+        self.assertEqual(movie.tmdb_rating, 8.6)
+        self.assertEqual(movie.our_rating, 9.0)
+
+    def test_invalid_movie_is_skipped_and_the_rest_of_the_batch_written(self):
+        stats = self.service.sync_movies_to_database([
+            self._tmdb_movie(550, 'Fight Club', 8.4),
+            self._tmdb_movie(551, 'Out Of Range', 11),
+            self._tmdb_movie(552, 'Heat', 7.9),
+        ])
+
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertCountEqual(Movie.objects.values_list('tmdb_id', flat=True), [550, 552])
@@ -35,6 +35,13 @@ from django.shortcuts import render
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Movie columns the list endpoint renders (MovieListSerializer). The list queryset loads only
+# these, the wide overview/tagline/main_cast/search_vector columns stay on the detail endpoint
+LIST_ONLY_FIELDS = (
+    'id', 'tmdb_id', 'title', 'release_date', 'tmdb_rating', 'our_rating',
+    'popularity_score', 'poster_path', 'runtime', 'views', 'like_count',
+)
+
 def movie_hub(request):
     """Movies app hub showing all available endpoints, grouped by section."""
 
@@ -137,10 +144,11 @@ class MovieViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Optimize queryset based on action."""
-        queryset = Movie.objects.select_related().prefetch_related('genres')
+        # search_vector is only filtered on in the database, never serialized
+        queryset = Movie.objects.select_related().prefetch_related('genres').defer('search_vector')
         
         if self.action == 'list':
-            queryset = queryset.defer('overview', 'tagline')  # Optimize list view
+            queryset = queryset.only(*LIST_ONLY_FIELDS)  # Optimize list view
         
         return queryset
 
@@ -5,7 +5,7 @@ Usage: python manage.py recommendation_analytics --days 30
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db.models import Count, Avg
+from django.db.models import Count, Avg, Q
 from datetime import timedelta
 import json
 
@@ -194,31 +194,38 @@ class Command(BaseCommand):
         
         User = get_user_model()
         
+        recent_cutoff = timezone.now() - timedelta(days=1)
+        
+        # One conditional aggregate per table instead of a separate COUNT per figure
+        movie_counts = Movie.objects.aggregate(
+            total=Count('id'),
+            with_ratings=Count('id', filter=Q(tmdb_rating__isnull=False)),
+        )
+        recommendation_counts = UserRecommendations.objects.aggregate(
+            total=Count('id'),
+            recent=Count('id', filter=Q(generated_at__gte=recent_cutoff)),
+        )
+        interaction_counts = UserMovieInteraction.objects.aggregate(
+            total=Count('id'),
+            recent=Count('id', filter=Q(timestamp__gte=recent_cutoff)),
+        )
+        
         # Basic counts
         stats = {
             'Total Users': User.objects.filter(is_active=True).count(),
-            'Total Movies': Movie.objects.count(),
+            'Total Movies': movie_counts['total'],
             'Total Genres': Genre.objects.count(),
-            'Total Recommendations': UserRecommendations.objects.count(),
-            'Total Interactions': UserMovieInteraction.objects.count(),
+            'Total Recommendations': recommendation_counts['total'],
+            'Total Interactions': interaction_counts['total'],
         }
         
         # Check for recent activity
-        recent_cutoff = timezone.now() - timedelta(days=1)
-        stats['Recent Interactions (24h)'] = UserMovieInteraction.objects.filter(
-            timestamp__gte=recent_cutoff
-        ).count()
-        
-        stats['Recent Recommendations (24h)'] = UserRecommendations.objects.filter(
-            generated_at__gte=recent_cutoff
-        ).count()
+        stats['Recent Interactions (24h)'] = interaction_counts['recent']
+        stats['Recent Recommendations (24h)'] = recommendation_counts['recent']
         
         # Data quality checks
-        movies_with_ratings = Movie.objects.filter(tmdb_rating__isnull=False).count()
-        total_movies = Movie.objects.count()
-        
-        if total_movies > 0:
-            quality_percentage = (movies_with_ratings / total_movies) * 100
+        if movie_counts['total'] > 0:
+            quality_percentage = (movie_counts['with_ratings'] / movie_counts['total']) * 100
             stats['Movie Data Quality'] = f'{quality_percentage:.1f}% have ratings'
         
         return stats
\ No newline at end of file
@@ -63,6 +63,7 @@ app.conf.update(
     task_routes={
         'apps.notifications.tasks.*': {'queue': 'notifications'},
         'apps.analytics.tasks.*': {'queue': 'analytics'}, 
+        'apps.authentication.tasks.*': {'queue': 'analytics'},
         'apps.movies.tasks.*': {'queue': 'recommendations'},
     },
     
@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Installed apps
     'rest_framework',
@@ -78,6 +79,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.authentication.middleware.ClientIPMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -148,7 +150,10 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('POSTGRES_HOST'),
         'PORT': os.getenv('POSTGRES_PORT'),
-
+        # Keep connections open between requests instead of reconnecting every time
+        'CONN_MAX_AGE': int(os.getenv('POSTGRES_CONN_MAX_AGE', 60)),
+        # Check a reused connection is still alive before the first query of a request
+        'CONN_HEALTH_CHECKS': True,
 
     }
 }
@@ -224,12 +229,13 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'UPDATE_LAST_LOGIN': False,  # Login view updates last_login itself
 }
 
 # DRF settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -354,6 +360,16 @@ LOGGING = {
             'format': '{levelname} {asctime} {message}',
             'style': '{',
         },
+        # Fields come from the extra dict passed by log_user_action
+        'user_activity': {
+            'format': 'User Action: {action} | User: {username} | IP: {ip_address} | Timestamp: {asctime} | Details: {details}',
+            'style': '{',
+        },
+        # Same line plus the user agent, only written in development
+        'user_activity_verbose': {
+            'format': 'User Action: {action} | User: {username} | IP: {ip_address} | User Agent: {user_agent} | Timestamp: {asctime} | Details: {details}',
+            'style': '{',
+        },
     },
     'handlers': {
         'console': {
@@ -373,6 +389,12 @@ LOGGING = {
             'filename': os.path.join(BASE_DIR, 'logs', 'analytics.log'),
             'formatter': 'verbose',
         },
+        'user_activity_file': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': os.path.join(BASE_DIR, 'logs', 'user_activity.log'),
+            'formatter': 'user_activity_verbose' if DEBUG else 'user_activity',
+        },
     },
     'loggers': {
         'analytics.middleware': {
@@ -390,6 +412,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # Written from a background thread, see apps/authentication/activity_log.py
+        'user_activity': {
+            'handlers': ['user_activity_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -418,10 +446,14 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_ENABLE_UTC = True
 
+# Hand user activity log records to a Celery worker instead of writing them in the web process
+ASYNC_ACTIVITY_LOG = os.getenv('ASYNC_ACTIVITY_LOG', 'False') == 'True'
+
 # Task routing
 CELERY_TASK_ROUTES = {
     'apps.notifications.tasks.*': {'queue': 'notifications'},
     'apps.analytics.tasks.*': {'queue': 'analytics'},
+    'apps.authentication.tasks.*': {'queue': 'analytics'},
     'apps.movies.tasks.*': {'queue': 'recommendations'},
 }
 
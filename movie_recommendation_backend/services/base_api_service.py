@@ -5,8 +5,10 @@ It includes different methods like handling API requests, error handling, cachin
 Our two main APIs will be able to inherit from this base service.
 """
 
+import orjson
 import requests
 import logging
+import threading
 import time
 import json
 from abc import ABC, abstractmethod
@@ -132,6 +134,8 @@ class BaseAPIService(ABC):
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
         self.last_request_time = 0
+        # Requests may be made from several threads (see TMDBService.get_movies_by_pages)
+        self._rate_limit_lock = threading.Lock()
 
         # Initialize the circuit breaker
         self.circuit_breaker = CircuitBreaker(
@@ -254,18 +258,19 @@ class BaseAPIService(ABC):
     # RATE LIMITING AND THROTTLING
     def _enforce_rate_limit(self):
         """
-        Enforce rate limiting by checking the time since the last request.
+        Enforce rate limiting by spacing request starts rate_limit_delay seconds apart.
+        Each caller reserves the next free slot under the lock, then sleeps until it outside the lock.
         """
-        current_time = time.time()
-        elapsed_time = current_time - self.last_request_time
+        with self._rate_limit_lock:
+            current_time = time.time()
+            request_time = max(current_time, self.last_request_time + self.rate_limit_delay)
+            self.last_request_time = request_time
 
-        if elapsed_time < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - elapsed_time
+        sleep_time = request_time - current_time
+        if sleep_time > 0:
             self.logger.info(f"Rate limit enforced. Sleeping for {sleep_time:.2f} seconds.")
             time.sleep(sleep_time)
 
-        self.last_request_time = current_time
-
     # Core request handling logic
     def _make_request(self,
                       endpoint: str,
@@ -313,8 +318,6 @@ class BaseAPIService(ABC):
                     json=data if method != 'GET' else None
                 )
 
-                self.last_request_time = time.time() # Update last request time 
-
                 return self._handle_response(response, endpoint, attempt)
             except requests.exceptions.Timeout as e:
                 last_exception = APITimeoutError(f" Request timeout: {e}")
@@ -356,10 +359,11 @@ class BaseAPIService(ABC):
         # Success
         if 200 <= status_code < 300:
             try:
-                data = response.json()
+                # TMDB/OMDB answer in UTF-8, orjson parses the raw bytes about twice as fast as json
+                data = orjson.loads(response.content)
                 self.logger.debug(f"Request successful: {endpoint}")
                 return data
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 raise APIServiceError(f"Invalid JSON response: {response.text[:200]}")
         
         # Client errors
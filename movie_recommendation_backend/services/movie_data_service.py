@@ -15,6 +15,9 @@ from .omdb_service import get_omdb_service
 
 logger = logging.getLogger(__name__)
 
+# Movies per INSERT ... ON CONFLICT statement when syncing to the database
+SYNC_BATCH_SIZE = 500
+
 # MOVIE DATA SERVICE - ORCHESTRATES MULTIPLE APIs
 class MovieDataService:
     """
@@ -326,8 +329,10 @@ class MovieDataService:
     def sync_movies_to_database(self, movie_data_list: List[Dict[str, Any]]) -> Dict[str, int]:
         """
         Sync multiple movies to the database with detailed error logging.
+        Movies are upserted in batches of SYNC_BATCH_SIZE, a batch that fails is retried
+        movie by movie so one bad row only costs that movie.
         """
-        from apps.movies.models import Movie, Genre
+        from apps.movies.models import Genre
         
         stats = {
             'created': 0,
@@ -338,82 +343,132 @@ class MovieDataService:
         
         self.logger.info(f"Starting database sync for {len(movie_data_list)} movies")
         
+        # Keyed by tmdb_id, a movie that is both popular and top rated is written once
+        prepared = {}
         for i, movie_data in enumerate(movie_data_list):
+            # Get the movie title for debugging - handle both data structures
+            movie_title = movie_data.get('title', movie_data.get('tmdb_data', {}).get('title', f'Movie #{i}'))
+            print(f"🎬 Processing movie {i+1}/{len(movie_data_list)}: {movie_title}")
+            
             try:
-                # Get the movie title for debugging - handle both data structures
-                movie_title = movie_data.get('title', movie_data.get('tmdb_data', {}).get('title', f'Movie #{i}'))
-                print(f"🎬 Processing movie {i+1}/{len(movie_data_list)}: {movie_title}")
-                
-                with transaction.atomic():
-                    # Prepare database data
-                    db_data = self.prepare_movie_for_database(movie_data)
-                    print(f"  📋 DB data keys: {list(db_data.keys())}")
-                    
-                    if not db_data.get('tmdb_id'):
-                        print(f"  ❌ No TMDB ID for movie: {movie_title}")
-                        stats['errors'] += 1
-                        continue
-                    
-                    print(f"  🔍 TMDB ID: {db_data.get('tmdb_id')}")
-                    print(f"  🔍 Title: {db_data.get('title')}")
-                    print(f"  🔍 Release date: {db_data.get('release_date')}")
-                    print(f"  🔍 Rating: {db_data.get('tmdb_rating')}")
-                    
-                    # Try to create the movie
+                db_data = self.prepare_movie_for_database(movie_data)
+            except Exception as e:
+                print(f"❌ FAILED to prepare movie {movie_title}: {e}")
+                stats['errors'] += 1
+                continue
+            
+            if not db_data.get('tmdb_id'):
+                print(f"  ❌ No TMDB ID for movie: {movie_title}")
+                stats['errors'] += 1
+                continue
+            
+            prepared[db_data['tmdb_id']] = (db_data, self._extract_genre_ids(movie_data))
+        
+        # TMDB genre id -> Genre pk, one query for the whole sync
+        genre_pks = dict(Genre.objects.values_list('tmdb_id', 'id'))
+        
+        items = list(prepared.values())
+        for start in range(0, len(items), SYNC_BATCH_SIZE):
+            batch = items[start:start + SYNC_BATCH_SIZE]
+            try:
+                batch_stats = self._upsert_movies(batch, genre_pks)
+            except Exception as e:
+                self.logger.error(f"Batch upsert of {len(batch)} movies failed, retrying one by one: {e}")
+                batch_stats = {'created': 0, 'updated': 0, 'errors': 0, 'genres_processed': 0}
+                for db_data, genre_ids in batch:
                     try:
-                        movie, created = Movie.objects.update_or_create(
-                            tmdb_id=db_data['tmdb_id'],
-                            defaults=db_data
-                        )
-                        print(f"  ✅ {'Created' if created else 'Updated'} movie: {movie.title}")
-                        
+                        movie_stats = self._upsert_movies([(db_data, genre_ids)], genre_pks)
                     except Exception as db_error:
-                        print(f"  ❌ Database error for {movie_title}: {db_error}")
+                        print(f"  ❌ Database error for {db_data.get('title')}: {db_error}")
                         print(f"  📊 DB data that failed: {db_data}")
-                        stats['errors'] += 1
+                        batch_stats['errors'] += 1
                         continue
-                    
-                    # ✅ FIXED: Handle genre relationships more flexibly
-                    genre_ids = []
-                    
-                    # Try to get genre_ids from different locations
-                    if 'genre_ids' in movie_data:
-                        genre_ids = movie_data['genre_ids']
-                    elif 'tmdb_data' in movie_data:
-                        tmdb_data = movie_data['tmdb_data']
-                        if 'genre_ids' in tmdb_data:
-                            genre_ids = tmdb_data['genre_ids']
-                        elif 'genres' in tmdb_data and tmdb_data['genres']:
-                            genre_ids = [g['id'] for g in tmdb_data['genres'] if 'id' in g]
-                    elif 'genres' in movie_data and movie_data['genres']:
-                        # Handle direct genres array
-                        genre_ids = [g['id'] for g in movie_data['genres'] if 'id' in g]
-                    
-                    print(f"  🎭 Genre IDs: {genre_ids}")
-                    
-                    if genre_ids:
-                        genres = Genre.objects.filter(tmdb_id__in=genre_ids)
-                        movie.genres.set(genres)
-                        stats['genres_processed'] += len(genres)
-                        print(f"  ✅ Set {len(genres)} genres")
-                    
-                    if created:
-                        stats['created'] += 1
-                    else:
-                        stats['updated'] += 1
-                        
-            except Exception as e:
-                movie_title = movie_data.get('title', movie_data.get('tmdb_data', {}).get('title', f'Movie #{i}'))
-                print(f"❌ FAILED to sync movie {movie_title}: {e}")
-                import traceback
-                traceback.print_exc()
-                stats['errors'] += 1
-                continue
+                    for key, value in movie_stats.items():
+                        batch_stats[key] += value
+            
+            for key, value in batch_stats.items():
+                stats[key] += value
+            print(f"  ✅ Synced movies {start + 1}-{start + len(batch)}: {batch_stats}")
         
         print(f"\n📊 Final sync stats: {stats}")
         self.logger.info(f"Database sync completed: {stats}")
         return stats
     
+    def _extract_genre_ids(self, movie_data: Dict[str, Any]) -> List[int]:
+        """TMDB genre ids of a movie, from whichever data structure it came in."""
+        if 'genre_ids' in movie_data:
+            return movie_data['genre_ids']
+        if 'tmdb_data' in movie_data:
+            tmdb_data = movie_data['tmdb_data']
+            if 'genre_ids' in tmdb_data:
+                return tmdb_data['genre_ids']
+            if 'genres' in tmdb_data and tmdb_data['genres']:
+                return [g['id'] for g in tmdb_data['genres'] if 'id' in g]
+        elif 'genres' in movie_data and movie_data['genres']:
+            # Handle direct genres array
+            return [g['id'] for g in movie_data['genres'] if 'id' in g]
+        return []
+    
+    def _upsert_movies(self, batch, genre_pks: Dict[int, int]) -> Dict[str, int]:
+        """
+        Insert or update a batch of (db_data, genre_ids) pairs in one transaction.
+        Uses INSERT ... ON CONFLICT (tmdb_id) DO UPDATE instead of one update_or_create per movie,
+        and replaces the genres of the movies that came with genre ids, like movie.genres.set().
+        """
+        from apps.movies.models import Movie, MovieGenre
+        
+        stats = {'created': 0, 'updated': 0, 'errors': 0, 'genres_processed': 0}
+        
+        with transaction.atomic():
+            # tmdb_id -> stored our_rating of the movies that already exist
+            existing = dict(Movie.objects.filter(
+                tmdb_id__in=[db_data['tmdb_id'] for db_data, _ in batch]
+            ).values_list('tmdb_id', 'our_rating'))
+            
+            # prepare_movie_for_database leaves out optional fields it has no value for. Rows are
+            # upserted per set of fields, so a missing field keeps its stored value on update
+            groups = {}
+            for db_data, genre_ids in batch:
+                movie = Movie(**db_data)
+                # bulk_create skips Movie.save(), so do its work here: fill in our_rating when
+                # the movie doesn't have one yet, and validate the row. A ValidationError fails
+                # the batch and sync_movies_to_database retries it movie by movie
+                if existing.get(movie.tmdb_id) is None and movie.tmdb_rating is not None:
+                    movie.our_rating = movie.calculate_our_rating()
+                    db_data = {**db_data, 'our_rating': movie.our_rating}
+                # tmdb_id is the conflict target, its unique check would reject every update
+                movie.full_clean(exclude=['tmdb_id'])
+                groups.setdefault(frozenset(db_data), []).append((movie, genre_ids))
+            
+            genre_links = []
+            movies_with_genres = []
+            for fields, movies in groups.items():
+                update_fields = sorted(fields - {'tmdb_id'}) + ['updated_at']
+                # On PostgreSQL the pks of inserted and updated rows are set on the instances
+                Movie.objects.bulk_create(
+                    [movie for movie, _ in movies],
+                    update_conflicts=True,
+                    unique_fields=['tmdb_id'],
+                    update_fields=update_fields,
+                )
+                for movie, genre_ids in movies:
+                    if movie.tmdb_id in existing:
+                        stats['updated'] += 1
+                    else:
+                        stats['created'] += 1
+                    
+                    if genre_ids:
+                        movies_with_genres.append(movie.pk)
+                        matched = {genre_pks[genre_id] for genre_id in genre_ids if genre_id in genre_pks}
+                        genre_links.extend(MovieGenre(movie_id=movie.pk, genre_id=genre_pk) for genre_pk in matched)
+                        stats['genres_processed'] += len(matched)
+            
+            if movies_with_genres:
+                MovieGenre.objects.filter(movie_id__in=movies_with_genres).delete()
+                MovieGenre.objects.bulk_create(genre_links, ignore_conflicts=True)
+        
+        return stats
+    
     # GENRE SYNCHRONIZATION
     def sync_genres_to_database(self) -> int:
         """
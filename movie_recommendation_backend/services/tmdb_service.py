@@ -10,6 +10,7 @@ The TMDB API documentation can be found at https://developers.themoviedb.org/3/g
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 
 from django.conf import settings
@@ -20,6 +21,10 @@ from .base_api_service import BaseAPIService, APIServiceError
 
 logger = logging.getLogger(__name__)
 
+# Pages fetched at once by get_movies_by_pages. The shared rate limiter still spaces the
+# requests, the threads only overlap the time spent waiting on TMDB
+PAGE_FETCH_WORKERS = 4
+
 # TMDB SERVICE IMPLEMENTATION
 
 class TMDBService(BaseAPIService):
@@ -344,6 +349,7 @@ class TMDBService(BaseAPIService):
     def get_movies_by_pages(self, endpoint_name: str, pages: int = 5) -> List[Dict[str, Any]]:
         """
         Get movies from multiple pages of a paginated endpoint.
+        Pages are fetched concurrently, results keep the page order.
         
         Args:
             endpoint_name: Name of endpoint ('popular_movies', 'top_rated_movies')
@@ -352,28 +358,36 @@ class TMDBService(BaseAPIService):
         Returns:
             List of all movies from all pages
         """
-        all_movies = []
+        if endpoint_name == 'popular_movies':
+            fetch_page = self.get_popular_movies
+        elif endpoint_name == 'top_rated_movies':
+            fetch_page = self.get_top_rated_movies
+        else:
+            raise ValueError(f"Unknown endpoint: {endpoint_name}")
         
-        for page in range(1, pages + 1):
+        def _fetch(page):
             try:
-                if endpoint_name == 'popular_movies':
-                    response = self.get_popular_movies(page)
-                elif endpoint_name == 'top_rated_movies':
-                    response = self.get_top_rated_movies(page)
-                else:
-                    raise ValueError(f"Unknown endpoint: {endpoint_name}")
-                
-                movies = response.get('results', [])
-                all_movies.extend(movies)
-                
-                self.logger.info(f"Fetched page {page}/{pages}: {len(movies)} movies")
-                
-                # If we get fewer than 20 movies, we've reached the end
-                if len(movies) < 20:
-                    break
-                    
+                return fetch_page(page)
             except Exception as e:
                 self.logger.error(f"Failed to fetch page {page}: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(PAGE_FETCH_WORKERS, pages))) as pool:
+            responses = list(pool.map(_fetch, range(1, pages + 1)))
+        
+        all_movies = []
+        
+        for page, response in enumerate(responses, start=1):
+            if response is None:
+                break
+            
+            movies = response.get('results', [])
+            all_movies.extend(movies)
+            
+            self.logger.info(f"Fetched page {page}/{pages}: {len(movies)} movies")
+            
+            # If we get fewer than 20 movies, we've reached the end
+            if len(movies) < 20:
                 break
         
         self.logger.info(f"Total movies fetched: {len(all_movies)}")